@@ -0,0 +1,274 @@
+"""
+Append-only analytics log with incremental rollups.
+
+The request path only enqueues a compact record. A background thread writes
+records to a JSON-lines file in batches and folds them into in-memory
+rollups (score histograms per field, weakness counts, daily ATS averages).
+Rollups are snapshotted next to the log together with the log offset they
+cover, so a restart only replays records written after the last snapshot.
+
+Several uvicorn processes may share one directory. Each appends to the same
+log under an exclusive lock and builds its rollups by reading the log, not
+from its own records, so every process reports the stats of all of them
+(up to one flush interval behind). Only the process holding rollup.lock
+writes the snapshot; if it exits, another one takes the lock over.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import fcntl
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _weakness_key(message: str) -> str:
+    """Group messages that only differ in numbers ("Only 3 skills" == "Only 4 skills")."""
+    return _NUMBER.sub("N", message)
+
+
+def make_record(result: Dict, timestamp: Optional[float] = None) -> Dict:
+    """Compact analytics record for one analyze() result."""
+    return {
+        "ts": round(timestamp if timestamp is not None else time.time(), 3),
+        "score": result["score"],
+        "field": result.get("field"),
+        "ats": result["ats_readiness"],
+        "weaknesses": sorted({_weakness_key(w) for w in result["weaknesses"]}),
+    }
+
+
+class AnalyticsRollup:
+    """Counters that are updated per record and read in constant time."""
+
+    HISTOGRAM_BINS = 10
+    TREND_DAYS = 30
+
+    def __init__(self):
+        self.records = 0
+        self.fields: Dict[str, Dict] = {}
+        self.weaknesses: Counter = Counter()
+        self.ats_by_day: Dict[str, Dict[str, float]] = {}
+
+    def add(self, record: Dict) -> None:
+        self.records += 1
+
+        field = record["field"] or "unknown"
+        stats = self.fields.setdefault(
+            field, {"count": 0, "score_total": 0.0, "histogram": [0] * self.HISTOGRAM_BINS}
+        )
+        stats["count"] += 1
+        stats["score_total"] += record["score"]
+        stats["histogram"][min(int(record["score"]), self.HISTOGRAM_BINS - 1)] += 1
+
+        self.weaknesses.update(record["weaknesses"])
+
+        day = datetime.fromtimestamp(record["ts"], tz=timezone.utc).strftime("%Y-%m-%d")
+        bucket = self.ats_by_day.setdefault(day, {"count": 0, "ats_total": 0.0})
+        bucket["count"] += 1
+        bucket["ats_total"] += record["ats"]
+        if len(self.ats_by_day) > self.TREND_DAYS:
+            del self.ats_by_day[min(self.ats_by_day)]
+
+    def stats(self, top_n: int = 10) -> Dict:
+        return {
+            "records": self.records,
+            "fields": {
+                field: {
+                    "count": s["count"],
+                    "mean_score": round(s["score_total"] / s["count"], 2),
+                    "score_histogram": list(s["histogram"]),
+                }
+                for field, s in self.fields.items()
+            },
+            "top_weaknesses": [
+                {"weakness": w, "count": c} for w, c in self.weaknesses.most_common(top_n)
+            ],
+            "ats_trend": [
+                {"day": day, "count": b["count"], "mean_ats": round(b["ats_total"] / b["count"], 1)}
+                for day, b in sorted(self.ats_by_day.items())
+            ],
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "records": self.records,
+            "fields": self.fields,
+            "weaknesses": dict(self.weaknesses),
+            "ats_by_day": self.ats_by_day,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AnalyticsRollup":
+        rollup = cls()
+        rollup.records = data["records"]
+        rollup.fields = data["fields"]
+        rollup.weaknesses = Counter(data["weaknesses"])
+        rollup.ats_by_day = data["ats_by_day"]
+        return rollup
+
+
+class AnalyticsSink:
+    """
+    Batches records on a background thread into an append-only log.
+
+    record() never blocks: if the queue is full the record is dropped and
+    counted as analytics.dropped.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        max_queue: int = 10000,
+    ):
+        self.directory = Path(directory)
+        self.log_path = self.directory / "analytics.jsonl"
+        self.rollup_path = self.directory / "rollup.json"
+        self.lock_path = self.directory / "rollup.lock"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot_lock = None
+        self.rollup, self._log_offset = self._load_rollup()
+        self._snapshot_offset = self._log_offset
+
+    def _load_rollup(self) -> Tuple[AnalyticsRollup, int]:
+        """
+        Load the last snapshot and replay only log lines written after it.
+        Without a snapshot this is a one-time full scan of the log.
+        """
+        rollup = AnalyticsRollup()
+        offset = 0
+        if self.rollup_path.exists():
+            try:
+                snapshot = json.loads(self.rollup_path.read_text())
+                rollup = AnalyticsRollup.from_dict(snapshot["rollup"])
+                offset = snapshot["log_offset"]
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Analytics rollup unreadable, rebuilding from log: {e}")
+                rollup, offset = AnalyticsRollup(), 0
+        return rollup, offset + self._fold_log(rollup, offset)
+
+    def _fold_log(self, rollup: AnalyticsRollup, offset: int) -> int:
+        """Fold complete log lines after offset into rollup; returns the bytes consumed."""
+        if not self.log_path.exists():
+            return 0
+        with self.log_path.open("rb") as log:
+            log.seek(offset)
+            data = log.read()
+        # A batch another process is still writing may end mid-line
+        data = data[:data.rfind(b"\n") + 1]
+        for line in data.splitlines():
+            if line.strip():
+                rollup.add(json.loads(line))
+        return len(data)
+
+    def start(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        try:
+            self._refresh()
+        except OSError as e:
+            logger.error(f"Failed to update analytics rollup: {e}")
+        if self._snapshot_lock is not None:
+            self._snapshot_lock.close()
+            self._snapshot_lock = None
+
+    def record(self, result: Dict) -> None:
+        """Enqueue one analyze() result. Safe to call from the request path."""
+        try:
+            self._queue.put_nowait(make_record(result))
+        except queue.Full:
+            metrics.increment("analytics.dropped")
+
+    def stats(self, top_n: int = 10) -> Dict:
+        with self._lock:
+            return self.rollup.stats(top_n)
+
+    def _collect_batch(self, first: Dict) -> List[Dict]:
+        """Gather up to batch_size records, waiting at most flush_interval."""
+        batch = [first]
+        flush_at = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = 0 if self._stop.is_set() else flush_at - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=max(0, timeout)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                first = None
+            try:
+                if first is not None:
+                    self._write_batch(self._collect_batch(first))
+                # Pick up what other processes appended, even when this one is idle
+                self._refresh()
+            except OSError as e:
+                logger.error(f"Failed to write analytics batch: {e}")
+
+    def _write_batch(self, batch: List[Dict]) -> None:
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in batch).encode()
+        with self.log_path.open("ab") as log:
+            # One locked write per batch, so batches of different processes never interleave
+            fcntl.flock(log, fcntl.LOCK_EX)
+            try:
+                log.write(data)
+                log.flush()
+            finally:
+                fcntl.flock(log, fcntl.LOCK_UN)
+        metrics.increment("analytics.records_written", len(batch))
+
+    def _refresh(self) -> None:
+        """Fold new log lines from every process into the rollup, then snapshot if we own it."""
+        with self._lock:
+            self._log_offset += self._fold_log(self.rollup, self._log_offset)
+            if self._log_offset == self._snapshot_offset or not self._owns_snapshot():
+                return
+            snapshot = json.dumps({"log_offset": self._log_offset, "rollup": self.rollup.to_dict()})
+            self._snapshot_offset = self._log_offset
+
+        # Write-then-rename so a crash never leaves a half-written snapshot
+        tmp_path = self.rollup_path.with_suffix(".tmp")
+        tmp_path.write_text(snapshot)
+        os.replace(tmp_path, self.rollup_path)
+
+    def _owns_snapshot(self) -> bool:
+        """Whether this process holds rollup.lock, trying to take it over if not."""
+        if self._snapshot_lock is None:
+            lock = self.lock_path.open("a")
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock.close()
+                return False
+            self._snapshot_lock = lock
+        return True
@@ -2,11 +2,82 @@
 Resume analyzer with section detection and rule-based scoring.
 """
 import re
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, Iterator, List, Pattern, Tuple, Optional
+import functools
 import logging
 
+from app.deadline import Deadline
+from app.profiles import ScoringProfile, profiles
+from app.tracing import tracer
+from app.utils.text_shaping import shape_text
+
 logger = logging.getLogger(__name__)
 
+# Every pattern below runs in time linear in the text it scans. A pattern
+# that starts with an unbounded run (\d+, [\w.-]+) is anchored to the start
+# of that run with a lookbehind, so a long run of digits or word characters
+# is scanned once instead of once per character. Line-anchored patterns use
+# [^\S\n] rather than \s before their first real character, so a scan from
+# one line start cannot run on across a block of blank lines. Everything
+# else is bounded ({1,3}, {4}) or stops at the first character that cannot
+# continue the match.
+_EMAIL = re.compile(r'(?<![\w.-])[\w.-]+@[\w.-]+\.\w+')
+_PHONE = re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+_DATE = re.compile(
+    r'\d{4}[-–—]\d{4}|\d{4}\s*[-–—]\s*present|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec',
+    re.IGNORECASE,
+)
+_ACHIEVEMENTS = [
+    re.compile(r'(?<!\d)\d+%'),
+    re.compile(r'\$\d+'),
+    re.compile(r'(?<!\d)\d+\+'),
+    re.compile(r'increased|decreased|improved|reduced|achieved|delivered|managed|led', re.IGNORECASE),
+    re.compile(r'(?<!\d)\d+\s*(users|customers|projects|team members|employees)', re.IGNORECASE),
+]
+_PROJECT_INDICATORS = [
+    re.compile(r'project\s+\d+', re.IGNORECASE),
+    re.compile(r'^[^\S\n]*[-•*]\s+[A-Z]', re.MULTILINE | re.IGNORECASE),
+    re.compile(r'^[^\S\n]*\d+[\.)]\s+[A-Z]', re.MULTILINE | re.IGNORECASE),
+]
+_INLINE_BULLET = re.compile(r'[-•*]\s+')
+_LEADING_BULLET = re.compile(r'^[^\S\n]*[-•*]', re.MULTILINE)
+_ATS_BULLETS = [
+    re.compile(r'^[^\S\n]*[-•*]\s+', re.MULTILINE),
+    re.compile(r'^[^\S\n]*\d+[\.)]\s+', re.MULTILINE),
+]
+# A line holding nothing but '#' and whitespace
+_BLANKISH_LINE = re.compile(r'(?:[^\S\n]|#)*')
+
+
+@functools.lru_cache(maxsize=None)
+def _header_pattern(keyword: str) -> Pattern[str]:
+    """A line that is just `keyword`, give or take '#', ':' and whitespace."""
+    return re.compile(
+        rf'^(?:[^\S\n]|#)*{re.escape(keyword)}(?:[^\S\n]|:)*$', re.IGNORECASE | re.MULTILINE
+    )
+
+
+def _find_header(text: str, keyword: str) -> int:
+    r"""
+    Offset of the header line for `keyword`, or -1.
+
+    Same answer as re.search(r'^[#\s]*keyword[:\s]*$', text, re.M).start():
+    the match is moved back over blank or '#'-only lines directly above the
+    header, as [#\s]* would have absorbed them. Matching one line at a time
+    and walking back once keeps this linear, where the \s version rescans a
+    block of blank lines from each of its line starts.
+    """
+    match = _header_pattern(keyword).search(text)
+    if not match:
+        return -1
+    start = match.start()
+    while start > 0:
+        previous = text.rfind('\n', 0, start - 1) + 1
+        if _BLANKISH_LINE.fullmatch(text, previous, start - 1) is None:
+            break
+        start = previous
+    return start
+
 
 class ResumeAnalyzer:
     """Analyzes resumes and provides scores and feedback."""
@@ -20,57 +91,20 @@ class ResumeAnalyzer:
         'certifications': ['certifications', 'certificates', 'certification', 'credentials']
     }
     
-    SKILL_KEYWORDS = [
-        'python', 'java', 'javascript', 'typescript', 'react', 'node', 'sql', 'html', 'css',
-        'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'git', 'github', 'gitlab',
-        'machine learning', 'deep learning', 'data science', 'analytics',
-        'agile', 'scrum', 'ci/cd', 'devops', 'microservices', 'api', 'rest',
-        'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
-        'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn'
-    ]
-
-    FIELD_KEYWORDS = {
-        "software / it": [
-            "computer science", "software engineering", "software engineer",
-            "full stack", "frontend", "backend", "web development",
-            "developer", "programmer", "cloud computing", "devops"
-        ],
-        "data / ai": [
-            "data science", "data scientist", "machine learning", "deep learning",
-            "artificial intelligence", "ml engineer", "data engineer",
-            "analytics", "business intelligence"
-        ],
-        "cybersecurity": [
-            "cyber security", "cybersecurity", "information security", "infosec",
-            "penetration testing", "security analyst", "security engineer"
-        ],
-        "mechanical engineering": [
-            "mechanical engineering", "mechanical engineer", "thermodynamics",
-            "cad", "solidworks"
-        ],
-        "electrical / electronics": [
-            "electrical engineering", "electronics engineering",
-            "embedded systems", "circuit design", "fpga"
-        ],
-        "business / management": [
-            "business administration", "mba", "management", "project management",
-            "product manager", "business analyst"
-        ],
-        "finance": [
-            "finance", "financial analyst", "accounting", "investment",
-            "banking", "portfolio management"
-        ],
-        "marketing": [
-            "marketing", "digital marketing", "seo",
-            "content marketing", "brand management"
-        ],
-    }
-    
-    def __init__(self, text: str):
+    def __init__(self, text: str, deadline: Optional[Deadline] = None):
+        with tracer.span("shape_text", characters=len(text)):
+            text = shape_text(text)
         self.text = text.lower()
+        self.deadline = deadline
         self.lines = [line.strip() for line in text.split('\n') if line.strip()]
         self.detected_sections: Dict[str, bool] = {}
         self.detected_field: Optional[str] = None
+        self._section_texts: Dict[str, str] = {}
+
+    @property
+    def profile(self) -> ScoringProfile:
+        """Scoring profile for the detected field (the default one until detect_field runs)."""
+        return profiles.get(self.detected_field)
         
     def detect_sections(self) -> Dict[str, bool]:
         sections = {}
@@ -78,8 +112,7 @@ class ResumeAnalyzer:
         for section_name, keywords in self.SECTION_KEYWORDS.items():
             found = False
             for keyword in keywords:
-                pattern = rf'^[#\s]*{re.escape(keyword)}[:\s]*$'
-                if re.search(pattern, self.text, re.IGNORECASE | re.MULTILINE):
+                if _header_pattern(keyword).search(self.text):
                     found = True
                     break
                 if keyword in self.text:
@@ -105,21 +138,22 @@ class ResumeAnalyzer:
             weaknesses.append("Skills section is empty or not found")
             return score, strengths, weaknesses
         
+        profile = self.profile
         skill_count = len(re.findall(r'[,\n]', skills_text)) + 1
-        if skill_count < 5:
+        if skill_count < profile["min_skill_count"]:
             weaknesses.append(f"Only {skill_count} skills listed - consider adding more")
-        elif skill_count >= 10:
+        elif skill_count >= profile["good_skill_count"]:
             strengths.append(f"Good variety of skills ({skill_count} skills listed)")
             score += 0.5
         else:
             score += 0.3
         
-        found_keywords = [kw for kw in self.SKILL_KEYWORDS if kw in skills_text.lower()]
+        found_keywords = profile.skills.find(skills_text.lower())
         
-        if len(found_keywords) >= 5:
+        if len(found_keywords) >= profile["strong_keyword_hits"]:
             strengths.append("Strong technical skills with relevant technologies")
             score += 0.8
-        elif len(found_keywords) >= 3:
+        elif len(found_keywords) >= profile["some_keyword_hits"]:
             score += 0.5
         else:
             weaknesses.append("Consider adding more technical skills relevant to your field")
@@ -147,8 +181,7 @@ class ResumeAnalyzer:
             weaknesses.append("Experience section is empty")
             return score, strengths, weaknesses
         
-        date_pattern = r'\d{4}[-–—]\d{4}|\d{4}\s*[-–—]\s*present|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec'
-        date_matches = len(re.findall(date_pattern, experience_text, re.IGNORECASE))
+        date_matches = len(_DATE.findall(experience_text))
         
         if date_matches >= 2:
             strengths.append(f"Multiple positions listed ({date_matches} positions)")
@@ -158,13 +191,7 @@ class ResumeAnalyzer:
         else:
             weaknesses.append("No dates found in experience section")
         
-        achievement_patterns = [
-            r'\d+%', r'\$\d+', r'\d+\+', 
-            r'increased|decreased|improved|reduced|achieved|delivered|managed|led',
-            r'\d+\s*(users|customers|projects|team members|employees)'
-        ]
-        
-        achievement_count = sum(len(re.findall(p, experience_text, re.IGNORECASE)) for p in achievement_patterns)
+        achievement_count = sum(len(pattern.findall(experience_text)) for pattern in _ACHIEVEMENTS)
         
         if achievement_count >= 5:
             strengths.append("Strong use of quantifiable achievements")
@@ -242,15 +269,9 @@ class ResumeAnalyzer:
             weaknesses.append("Projects section is empty")
             return score, strengths, weaknesses
         
-        project_indicators = [
-            r'project\s+\d+',
-            r'^\s*[-•*]\s+[A-Z]',
-            r'^\s*\d+[\.)]\s+[A-Z]',
-        ]
-        
         project_count = 0
-        for pattern in project_indicators:
-            matches = len(re.findall(pattern, projects_text, re.MULTILINE | re.IGNORECASE))
+        for pattern in _PROJECT_INDICATORS:
+            matches = len(pattern.findall(projects_text))
             project_count = max(project_count, matches)
         
         if project_count == 0:
@@ -270,9 +291,10 @@ class ResumeAnalyzer:
             weaknesses.append("No clear projects identified")
             return score, strengths, weaknesses
         
-        tech_mentions = sum(1 for keyword in self.SKILL_KEYWORDS[:10] if keyword in projects_text.lower())
+        profile = self.profile
+        tech_mentions = len(profile.project_keywords.find(projects_text.lower()))
         
-        if tech_mentions >= 3:
+        if tech_mentions >= profile["strong_project_mentions"]:
             strengths.append("Projects include relevant technical details")
             score += 0.7
         elif tech_mentions >= 1:
@@ -291,8 +313,7 @@ class ResumeAnalyzer:
         strengths = []
         weaknesses = []
         
-        bullet_patterns = [r'[-•*]\s+', r'^\s*[-•*]']
-        has_bullets = any(re.search(pattern, self.text, re.MULTILINE) for pattern in bullet_patterns)
+        has_bullets = any(pattern.search(self.text) for pattern in (_INLINE_BULLET, _LEADING_BULLET))
         
         if has_bullets:
             strengths.append("Uses bullet points for readability")
@@ -319,11 +340,7 @@ class ResumeAnalyzer:
         else:
             score += 0.2
         
-        contact_patterns = [
-            r'[\w\.-]+@[\w\.-]+\.\w+',
-            r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-        ]
-        has_contact = any(re.search(pattern, self.text, re.IGNORECASE) for pattern in contact_patterns)
+        has_contact = any(pattern.search(self.text) for pattern in (_EMAIL, _PHONE))
         
         if has_contact:
             strengths.append("Contact information present")
@@ -351,8 +368,8 @@ class ResumeAnalyzer:
         else:
             weaknesses.append("Missing one or more core sections that ATS tools expect")
 
-        has_email = bool(re.search(r"[\w\.-]+@[\w\.-]+\.\w+", text))
-        has_phone = bool(re.search(r"\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text))
+        has_email = bool(_EMAIL.search(text))
+        has_phone = bool(_PHONE.search(text))
 
         if has_email and has_phone:
             score += 10
@@ -363,8 +380,7 @@ class ResumeAnalyzer:
         else:
             weaknesses.append("ATS may struggle to find your contact info")
 
-        bullet_patterns = [r"^\s*[-•*]\s+", r"^\s*\d+[\.)]\s+"]
-        has_bullets = any(re.search(p, text, re.MULTILINE) for p in bullet_patterns)
+        has_bullets = any(pattern.search(text) for pattern in _ATS_BULLETS)
 
         avg_line_len = sum(len(l) for l in self.lines) / len(self.lines) if self.lines else 0
 
@@ -407,16 +423,20 @@ class ResumeAnalyzer:
         return score, strengths, weaknesses
     
     def _extract_section_text(self, section_name: str) -> str:
+        # Scorers and detect_field ask for the same sections; scan each once
+        if section_name not in self._section_texts:
+            self._section_texts[section_name] = self._scan_section_text(section_name)
+        return self._section_texts[section_name]
+
+    def _scan_section_text(self, section_name: str) -> str:
         keywords = self.SECTION_KEYWORDS.get(section_name, [])
         if not keywords:
             return ""
         
         section_start = -1
         for keyword in keywords:
-            pattern = rf'^[#\s]*{re.escape(keyword)}[:\s]*$'
-            match = re.search(pattern, self.text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                section_start = match.start()
+            section_start = _find_header(self.text, keyword)
+            if section_start != -1:
                 break
         
         if section_start == -1:
@@ -437,15 +457,47 @@ class ResumeAnalyzer:
             if other_section == section_name:
                 continue
             for keyword in other_keywords:
-                pattern = rf'^[#\s]*{re.escape(keyword)}[:\s]*$'
-                match = re.search(pattern, remaining_text, re.IGNORECASE | re.MULTILINE)
-                if match and match.start() < next_section:
-                    next_section = match.start()
+                start = _find_header(remaining_text, keyword)
+                if start != -1 and start < next_section:
+                    next_section = start
         
         return remaining_text[:next_section]
 
+    # Header keyword -> section, for the single-pass scan used by quick analyses
+    HEADER_SECTIONS = {kw: section for section, kws in SECTION_KEYWORDS.items() for kw in kws}
+
+    def _index_sections_single_pass(self) -> Dict[str, str]:
+        """
+        Approximate _scan_section_text for every section with one pass over
+        the lines instead of one regex scan per keyword. Header lines are
+        matched exactly (after trimming '#', ':' and whitespace), so results
+        can differ from the full scan on unusual layouts.
+        """
+        headers: List[Tuple[int, str]] = []
+        offset = 0
+        for line in self.text.split('\n'):
+            section = self.HEADER_SECTIONS.get(line.lstrip('# \t').rstrip(': \t'))
+            if section:
+                headers.append((offset, section))
+            offset += len(line) + 1
+
+        texts = {}
+        for section_name, keywords in self.SECTION_KEYWORDS.items():
+            start = next((pos for pos, section in headers if section == section_name), -1)
+            if start == -1:
+                start = next((self.text.find(kw) for kw in keywords if kw in self.text), -1)
+            if start == -1:
+                texts[section_name] = ""
+                continue
+            end = next(
+                (pos for pos, section in headers if pos > start and section != section_name),
+                len(self.text),
+            )
+            texts[section_name] = self.text[start:end]
+        return texts
+
     def _get_field_keywords(self, field_name: str) -> List[str]:
-        return self.FIELD_KEYWORDS.get(field_name, [])
+        return profiles.field_keywords().get(field_name, [])
 
     def detect_field(self) -> Optional[str]:
         relevant_text_parts = []
@@ -458,7 +510,8 @@ class ResumeAnalyzer:
         best_field = None
         best_score = 0
 
-        for field_name, keywords in self.FIELD_KEYWORDS.items():
+        # Each profile in app/scoring_profiles/ lists the keywords that identify its field
+        for field_name, keywords in profiles.field_keywords().items():
             hits = sum(1 for kw in keywords if kw in combined_text_lower)
             if hits > best_score:
                 best_score = hits
@@ -471,39 +524,118 @@ class ResumeAnalyzer:
 
         return self.detected_field
     
-    def analyze(self) -> Dict:
-        self.detect_sections()
-        self.detect_field()
-        
-        skills_score, skills_strengths, skills_weaknesses = self.analyze_skills()
-        exp_score, exp_strengths, exp_weaknesses = self.analyze_experience()
-        edu_score, edu_strengths, edu_weaknesses = self.analyze_education()
-        proj_score, proj_strengths, proj_weaknesses = self.analyze_projects()
-        fmt_score, fmt_strengths, fmt_weaknesses = self.analyze_formatting()
-        ats_score, ats_strengths, ats_weaknesses = self.analyze_ats_readiness()
-        
-        total_score = skills_score + exp_score + edu_score + proj_score + fmt_score
-        
-        strengths = skills_strengths + exp_strengths + edu_strengths + proj_strengths + fmt_strengths + ats_strengths
-        weaknesses = skills_weaknesses + exp_weaknesses + edu_weaknesses + proj_weaknesses + fmt_weaknesses + ats_weaknesses
+    def _check_deadline(self) -> None:
+        if self.deadline:
+            self.deadline.check()
+
+    # Bump when scoring rules change so stored results are not reused
+    SCORING_VERSION = 4
+
+    QUICK = "quick"
+    FULL = "full"
+    DEPTHS = (QUICK, FULL)
+
+    SECTION_SCORERS = (
+        ("skills", "analyze_skills"),
+        ("experience", "analyze_experience"),
+        ("education", "analyze_education"),
+        ("projects", "analyze_projects"),
+        ("formatting", "analyze_formatting"),
+    )
+
+    def iter_analysis(self, depth: str = FULL) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the analysis stage by stage, yielding (event, payload) pairs as
+        each result becomes available. The last event is always "result",
+        whose payload is identical to what analyze() returns.
+
+        depth="quick" computes only what the total score and field need: it
+        skips the ATS stage. The section scorers still produce their feedback
+        as a by-product of scoring, but quick "section_score" events and the
+        result leave it out.
+        """
+        if depth not in self.DEPTHS:
+            raise ValueError(f"Unknown analysis depth: {depth}")
+        if depth == self.QUICK:
+            self._section_texts.update(self._index_sections_single_pass())
+
+        self._check_deadline()
+        with tracer.span("detect_sections", characters=len(self.text)):
+            detected_sections = self.detect_sections()
+        yield "sections", {"detected_sections": detected_sections}
+
+        self._check_deadline()
+        with tracer.span("detect_field"):
+            detected_field = self.detect_field()
+        yield "field", {"field": detected_field}
+
+        section_scores: Dict[str, float] = {}
+        strengths: List[str] = []
+        weaknesses: List[str] = []
+
+        for section, method_name in self.SECTION_SCORERS:
+            self._check_deadline()
+            with tracer.span(method_name):
+                score, section_strengths, section_weaknesses = getattr(self, method_name)()
+            section_scores[section] = score
+            if depth == self.QUICK:
+                yield "section_score", {"section": section, "score": round(score, 1)}
+                continue
+            strengths += section_strengths
+            weaknesses += section_weaknesses
+            yield "section_score", {
+                "section": section,
+                "score": round(score, 1),
+                "strengths": section_strengths,
+                "weaknesses": section_weaknesses,
+            }
+
+        total_score = round(sum(section_scores.values()), 1)
+        rounded_sections = {name: round(score, 1) for name, score in section_scores.items()}
+
+        if depth == self.QUICK:
+            yield "result", {
+                "score": total_score,
+                "sections": rounded_sections,
+                "strengths": [],
+                "weaknesses": [],
+                "detected_sections": self.detected_sections,
+                "ats_readiness": None,
+                "field": self.detected_field,
+                "depth": depth,
+            }
+            return
+
+        self._check_deadline()
+        with tracer.span("analyze_ats_readiness"):
+            ats_score, ats_strengths, ats_weaknesses = self.analyze_ats_readiness()
+        strengths += ats_strengths
+        weaknesses += ats_weaknesses
+        yield "ats_readiness", {
+            "ats_readiness": ats_score,
+            "strengths": ats_strengths,
+            "weaknesses": ats_weaknesses,
+        }
 
         if self.detected_field:
             strengths.append(f"Primary field detected as: {self.detected_field.title()}")
         else:
             weaknesses.append("Could not clearly detect your primary field of study or work.")
-        
-        return {
-            "score": round(total_score, 1),
-            "sections": {
-                "skills": round(skills_score, 1),
-                "experience": round(exp_score, 1),
-                "education": round(edu_score, 1),
-                "projects": round(proj_score, 1),
-                "formatting": round(fmt_score, 1),
-            },
+
+        yield "result", {
+            "score": total_score,
+            "sections": rounded_sections,
             "strengths": strengths,
             "weaknesses": weaknesses,
             "detected_sections": self.detected_sections,
             "ats_readiness": ats_score,
             "field": self.detected_field,
+            "depth": depth,
         }
+
+    def analyze(self, depth: str = FULL) -> Dict:
+        result: Dict = {}
+        for event, payload in self.iter_analysis(depth):
+            if event == "result":
+                result = payload
+        return result
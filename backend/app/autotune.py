@@ -0,0 +1,274 @@
+"""
+Automatic sizing of the analysis pool.
+
+Sizing starts from the CPU and memory the process may actually use. That
+means cgroup quotas when running in a container, not the host's core count,
+divided by the number of server processes that share them.
+The pool then reports every job's extraction time, analysis time and worker
+RSS. From those measurements the Autotuner picks:
+
+- workers: one per usable core, but no more than fit in the memory limit at
+  the measured worker footprint;
+- admission limit: as many jobs as those workers can finish within
+  target_queue_seconds, so requests beyond that get a fast 503 instead of
+  timing out in the queue.
+
+Until enough jobs have been measured, an assumed worker RSS and cost per
+request stand in for the measurements.
+
+Both are kept within configured bounds, changed at most once per interval,
+and every decision records the reasoning behind it for GET /admin/autotune.
+"""
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceLimits(NamedTuple):
+    cpus: float
+    memory_bytes: Optional[int]
+    cpu_source: str
+    memory_source: str
+
+    def shared_by(self, processes: int) -> "ResourceLimits":
+        """This process's share when `processes` server processes run under the same limits."""
+        if processes <= 1:
+            return self
+        note = f", split across {processes} server processes"
+        return ResourceLimits(
+            self.cpus / processes,
+            self.memory_bytes // processes if self.memory_bytes else self.memory_bytes,
+            self.cpu_source + note,
+            self.memory_source + note,
+        )
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def detect_limits(cgroup_root: str = "/sys/fs/cgroup") -> ResourceLimits:
+    """CPUs and memory available to this process, honouring cgroup v2 and v1 limits."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus: float = len(os.sched_getaffinity(0))
+        cpu_source = "cpu affinity"
+    else:
+        cpus = os.cpu_count() or 1
+        cpu_source = "cpu count"
+
+    quota = None
+    cpu_max = _read(f"{cgroup_root}/cpu.max")
+    if cpu_max:
+        limit, _, period = cpu_max.partition(" ")
+        if limit != "max":
+            quota, cpu_quota_source = int(limit) / int(period or 100000), "cgroup v2 cpu.max"
+    else:
+        limit = _read(f"{cgroup_root}/cpu/cpu.cfs_quota_us")
+        period = _read(f"{cgroup_root}/cpu/cpu.cfs_period_us")
+        if limit and period and int(limit) > 0:
+            quota, cpu_quota_source = int(limit) / int(period), "cgroup v1 cfs quota"
+    if quota is not None and quota < cpus:
+        cpus, cpu_source = quota, cpu_quota_source
+
+    try:
+        memory: Optional[int] = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        memory_source = "physical memory"
+    except (ValueError, OSError, AttributeError):
+        memory, memory_source = None, "unknown"
+
+    for path, source in (
+        (f"{cgroup_root}/memory.max", "cgroup v2 memory.max"),
+        (f"{cgroup_root}/memory/memory.limit_in_bytes", "cgroup v1 memory limit"),
+    ):
+        value = _read(path)
+        if value and value.isdigit():
+            # v1 reports "no limit" as a huge number, so only trust values below physical memory
+            if memory is None or int(value) < memory:
+                memory, memory_source = int(value), source
+            break
+
+    return ResourceLimits(cpus, memory, cpu_source, memory_source)
+
+
+class TuningDecision(NamedTuple):
+    workers: int
+    admission_limit: int
+    reasons: List[str]
+    decided_at: float
+
+    def to_dict(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "admission_limit": self.admission_limit,
+            "reasons": self.reasons,
+            "decided_at": self.decided_at,
+        }
+
+
+def _clamp(value: int, low: int, high: int) -> int:
+    return max(low, min(high, value))
+
+
+class Autotuner:
+    """
+    Chooses the analysis pool's worker count and admission limit from the
+    resource limits and a sliding window of per-job measurements.
+
+    observe() records one finished job. maybe_decide() returns a new
+    decision once min_samples jobs have been seen and interval seconds have
+    passed since the last change, and only if the decision differs from the
+    current one. Resizing the pool starts new worker processes, so changes
+    are rate-limited.
+    """
+
+    def __init__(
+        self,
+        limits: ResourceLimits,
+        min_workers: int = 1,
+        max_workers: Optional[int] = None,
+        min_admission: int = 2,
+        max_admission: int = 64,
+        target_queue_seconds: float = 10.0,
+        memory_headroom: float = 0.8,
+        assumed_worker_rss_mb: float = 200,
+        assumed_request_seconds: float = 1.0,
+        min_samples: int = 20,
+        interval: float = 30.0,
+        window: int = 200,
+    ):
+        self.limits = limits
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers or math.ceil(limits.cpus))
+        self.min_admission = min_admission
+        self.max_admission = max_admission
+        self.target_queue_seconds = target_queue_seconds
+        self.memory_headroom = memory_headroom
+        self.assumed_worker_rss_bytes = assumed_worker_rss_mb * 2**20
+        self.assumed_request_seconds = assumed_request_seconds
+        self.min_samples = min_samples
+        self.interval = interval
+        self._samples: Deque[Tuple[float, float, int]] = deque(maxlen=window)
+        self._history: Deque[TuningDecision] = deque(maxlen=20)
+        self._lock = threading.Lock()
+        self.current = self.decide()
+
+    def observe(self, extract_seconds: float, analyze_seconds: float, rss_bytes: int) -> None:
+        with self._lock:
+            self._samples.append((extract_seconds, analyze_seconds, rss_bytes))
+
+    def _measurements(self) -> Dict:
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return {"samples": 0}
+        extract = sum(s[0] for s in samples) / len(samples)
+        analyze = sum(s[1] for s in samples) / len(samples)
+        rss = sorted(s[2] for s in samples)
+        return {
+            "samples": len(samples),
+            "extract_seconds_mean": extract,
+            "analyze_seconds_mean": analyze,
+            "worker_rss_p95_bytes": rss[min(len(rss) - 1, math.ceil(0.95 * len(rss)) - 1)],
+        }
+
+    def decide(self, parent_rss_bytes: int = 0) -> TuningDecision:
+        """Compute the worker count and admission limit for the current measurements."""
+        measured = self._measurements()
+        reasons = []
+
+        cpu_workers = max(1, math.floor(self.limits.cpus))
+        reasons.append(
+            f"{self.limits.cpus:g} CPUs usable ({self.limits.cpu_source}): "
+            f"at most {cpu_workers} CPU-bound workers"
+        )
+        workers = cpu_workers
+
+        if measured["samples"] >= self.min_samples:
+            worker_rss = measured["worker_rss_p95_bytes"]
+            rss_basis = f"measured p95 worker RSS {worker_rss / 2**20:.0f} MB"
+        else:
+            worker_rss = self.assumed_worker_rss_bytes
+            rss_basis = f"assumed worker RSS {worker_rss / 2**20:.0f} MB ({measured['samples']} samples so far)"
+        if self.limits.memory_bytes:
+            budget = self.limits.memory_bytes * self.memory_headroom - parent_rss_bytes
+            memory_workers = max(1, int(budget // worker_rss))
+            reasons.append(
+                f"{self.limits.memory_bytes / 2**20:.0f} MB memory ({self.limits.memory_source}), "
+                f"{self.memory_headroom:.0%} usable minus {parent_rss_bytes / 2**20:.0f} MB for the server, "
+                f"{rss_basis}: at most {memory_workers} workers"
+            )
+            if memory_workers < workers:
+                workers = memory_workers
+
+        bounded = _clamp(workers, self.min_workers, self.max_workers)
+        if bounded != workers:
+            reasons.append(f"clamped {workers} workers to bounds [{self.min_workers}, {self.max_workers}]")
+        workers = bounded
+
+        if measured["samples"] >= self.min_samples:
+            service = measured["extract_seconds_mean"] + measured["analyze_seconds_mean"]
+            cost_basis = (
+                f"mean cost {service * 1000:.0f} ms per request "
+                f"({measured['extract_seconds_mean'] * 1000:.0f} ms extraction, "
+                f"{measured['analyze_seconds_mean'] * 1000:.0f} ms analysis)"
+            )
+        else:
+            service = self.assumed_request_seconds
+            cost_basis = f"assumed cost {service * 1000:.0f} ms per request ({measured['samples']} samples so far)"
+        rate = workers / service if service > 0 else float("inf")
+        queued = int(self.target_queue_seconds * rate) if math.isfinite(rate) else self.max_admission
+        admission = workers + queued
+        reasons.append(
+            f"{cost_basis}: {workers} workers clear {rate:.1f} req/s, so admit {workers} running + "
+            f"{queued} queued to keep queueing under {self.target_queue_seconds:g} s"
+        )
+
+        bounded = _clamp(admission, max(self.min_admission, workers), self.max_admission)
+        if bounded != admission:
+            reasons.append(f"clamped admission {admission} to bounds [{max(self.min_admission, workers)}, {self.max_admission}]")
+
+        return TuningDecision(workers, bounded, reasons, time.time())
+
+    def maybe_decide(self, parent_rss_bytes: int = 0) -> Optional[TuningDecision]:
+        """A new decision if one is due and differs from the current one, else None."""
+        with self._lock:
+            if len(self._samples) < self.min_samples or time.time() - self.current.decided_at < self.interval:
+                return None
+        decision = self.decide(parent_rss_bytes)
+        with self._lock:
+            if (decision.workers, decision.admission_limit) == (self.current.workers, self.current.admission_limit):
+                # Nothing to change; restart the interval so we do not re-evaluate on every job
+                self.current = self.current._replace(reasons=decision.reasons, decided_at=decision.decided_at)
+                return None
+            self._history.append(self.current)
+            self.current = decision
+        logger.info(
+            f"Autotuner: {decision.workers} workers, admission limit {decision.admission_limit}; "
+            + "; ".join(decision.reasons)
+        )
+        return decision
+
+    def snapshot(self) -> Dict:
+        measured = self._measurements()
+        with self._lock:
+            return {
+                "limits": self.limits._asdict(),
+                "bounds": {
+                    "workers": [self.min_workers, self.max_workers],
+                    "admission": [self.min_admission, self.max_admission],
+                },
+                "target_queue_seconds": self.target_queue_seconds,
+                "measurements": measured,
+                "current": self.current.to_dict(),
+                "history": [decision.to_dict() for decision in reversed(self._history)],
+            }
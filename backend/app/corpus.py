@@ -0,0 +1,169 @@
+"""
+Compact corpus of extracted resume text, for bulk re-scoring.
+
+One file holds the text of many uploads, each record compressed on its own
+with zlib, followed by a fixed-size index entry per record. Layout:
+
+    header   32 bytes   magic, version, record count, index offset
+    records  ...        zlib-compressed UTF-8 text, back to back
+    index    64 bytes   per record, sorted by SHA-256:
+                        sha256, offset, compressed length, text length,
+                        page count, extractor code
+
+CorpusReader memory-maps the file. Index entries are decoded straight out
+of the map, record payloads are handed out as memoryview slices of it, and
+only decompression allocates, so any number of processes can share one
+mapping of the file through the page cache.
+"""
+from typing import Iterator, NamedTuple, Optional
+import mmap
+import os
+import struct
+import zlib
+
+MAGIC = b"RACORPUS"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIQ8x")
+_ENTRY = struct.Struct("<32sQIIHB13x")
+
+# Extractor names stored as one byte; append only, never reorder
+EXTRACTORS = ("pdfplumber", "pypdf2", "docx", "text")
+
+
+class CorpusRecord(NamedTuple):
+    """Index entry of one record."""
+
+    sha256: str
+    offset: int
+    compressed_length: int
+    text_length: int
+    page_count: int
+    extractor: str
+
+
+class CorpusWriter:
+    """
+    Builds a corpus file. Records are appended as they are added; the index
+    is written and the file moved into place on close(), so readers never
+    see a half-written corpus.
+    """
+
+    def __init__(self, path: str, compression_level: int = 6):
+        self.path = path
+        self.compression_level = compression_level
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(b"\0" * _HEADER.size)
+        self._entries = {}
+
+    def add(self, sha256: str, text: str, page_count: int, extractor: str) -> bool:
+        """Append a record. Returns False (and stores nothing) for a hash already in the corpus."""
+        digest = bytes.fromhex(sha256)
+        if len(digest) != 32:
+            raise ValueError(f"Not a SHA-256 digest: {sha256}")
+        if digest in self._entries:
+            return False
+        encoded = text.encode("utf-8")
+        payload = zlib.compress(encoded, self.compression_level)
+        self._entries[digest] = (
+            self._file.tell(), len(payload), len(encoded), min(page_count, 0xFFFF), EXTRACTORS.index(extractor)
+        )
+        self._file.write(payload)
+        return True
+
+    def close(self) -> None:
+        index_offset = self._file.tell()
+        for digest in sorted(self._entries):
+            self._file.write(_ENTRY.pack(digest, *self._entries[digest]))
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, 0, len(self._entries), index_offset))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CorpusReader:
+    """Read-only, memory-mapped view of a corpus file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a resume corpus")
+        magic, version, _, self._count, self._index_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} resume corpus")
+        if self._index_offset + self._count * _ENTRY.size > len(self._map):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, i: int) -> CorpusRecord:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        digest, offset, compressed_length, text_length, page_count, extractor = _ENTRY.unpack_from(
+            self._map, self._index_offset + i * _ENTRY.size
+        )
+        return CorpusRecord(digest.hex(), offset, compressed_length, text_length, page_count, EXTRACTORS[extractor])
+
+    def payload(self, i: int) -> memoryview:
+        """The compressed bytes of record i, as a slice of the mapping (no copy)."""
+        record = self.record(i)
+        return self._view[record.offset:record.offset + record.compressed_length]
+
+    def text(self, i: int) -> str:
+        with self.payload(i) as payload:
+            return zlib.decompress(payload).decode("utf-8")
+
+    def find(self, sha256: str) -> Optional[int]:
+        """Position of the record with this hash, by binary search over the sorted index."""
+        digest = bytes.fromhex(sha256)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = self._index_offset + middle * _ENTRY.size
+            key = self._map[start:start + 32]
+            if key < digest:
+                low = middle + 1
+            elif key > digest:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def __iter__(self) -> Iterator[CorpusRecord]:
+        return (self.record(i) for i in range(self._count))
+
+    def close(self) -> None:
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> "CorpusReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
@@ -0,0 +1,63 @@
+"""
+Cooperative request deadlines for extraction and analysis.
+
+Long-running loops call Deadline.check() between units of work (PDF pages,
+analyzer stages) so an expired or cancelled request stops at the next
+boundary instead of running to completion.
+"""
+from typing import Optional
+import threading
+import time
+
+
+class DeadlineExceeded(Exception):
+    """Raised by Deadline.check() once the deadline passed or was cancelled."""
+
+    def __init__(self, reason: str = "timeout"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Deadline:
+    """
+    An absolute point in time after which work should stop, plus a cancel flag.
+
+    expires_at is a time.monotonic() value. On Linux the monotonic clock is
+    system-wide, so a deadline can be handed to a pool worker process as a
+    plain float. cancel_event can be any object with is_set()/set(), which
+    lets pool workers share a flag with the parent process.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        expires_at: Optional[float] = None,
+        cancel_event=None,
+    ):
+        if expires_at is None and timeout is not None:
+            expires_at = time.monotonic() + timeout
+        self.expires_at = expires_at
+        self._cancel_event = cancel_event if cancel_event is not None else threading.Event()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None when there is no time limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded if the work should stop now."""
+        if self.cancelled:
+            raise DeadlineExceeded("cancelled")
+        if self.expired():
+            raise DeadlineExceeded("timeout")
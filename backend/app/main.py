@@ -1,23 +1,99 @@
 """
 FastAPI application for Resume Analyzer.
 """
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, File, Request, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncIterator, Callable, Dict, Literal, Tuple
+import functools
+import hashlib
+import json
 import logging
+import os
 
 from app.models import AnalysisResponse
+from app.analytics import AnalyticsSink
+from app.autotune import Autotuner, detect_limits
+from app.result_store import ResultStore, is_sha256
 from app.analyzer import ResumeAnalyzer
-from app.utils.pdf_extractor import extract_text_from_pdf_bytes
+from app.deadline import Deadline, DeadlineExceeded
+from app.metrics import metrics
+from app.middleware import RequestTracingMiddleware
+from app.pool import AnalysisPool, PoolSaturated
+from app.supervisor import WorkerSupervisor
+from app.tracing import exporter_from_config, tracer
+from app.utils.formats import sniff_format
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-request budget for extraction plus analysis, in seconds
+ANALYSIS_TIMEOUT_SECONDS = float(os.getenv("ANALYSIS_TIMEOUT_SECONDS", "30"))
+# Pin the analysis worker count; by default the autotuner sizes the pool
+ANALYSIS_POOL_WORKERS = int(os.getenv("ANALYSIS_POOL_WORKERS", "0")) or None
+# uvicorn processes sharing this container's CPUs and memory (uvicorn's own --workers default)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+# Autotuner bounds: worker processes (max defaults to usable CPUs) and admitted jobs
+AUTOTUNE_MIN_WORKERS = int(os.getenv("AUTOTUNE_MIN_WORKERS", "1"))
+AUTOTUNE_MAX_WORKERS = int(os.getenv("AUTOTUNE_MAX_WORKERS", "0")) or None
+AUTOTUNE_MIN_ADMISSION = int(os.getenv("AUTOTUNE_MIN_ADMISSION", "2"))
+AUTOTUNE_MAX_ADMISSION = int(os.getenv("AUTOTUNE_MAX_ADMISSION", "64"))
+# Seconds between resizes, and how long admitted jobs may expect to queue
+AUTOTUNE_INTERVAL_SECONDS = float(os.getenv("AUTOTUNE_INTERVAL_SECONDS", "30"))
+AUTOTUNE_TARGET_QUEUE_SECONDS = float(os.getenv("AUTOTUNE_TARGET_QUEUE_SECONDS", "10"))
+# Replace an analysis worker once it passes this resident memory (MB) or request count
+WORKER_MAX_RSS_MB = float(os.getenv("WORKER_MAX_RSS_MB", "512"))
+WORKER_MAX_REQUESTS = int(os.getenv("WORKER_MAX_REQUESTS", "1000"))
+# Directory for the append-only analytics log and its rollups
+ANALYTICS_DIR = os.getenv("ANALYTICS_DIR", "data/analytics")
+# Trace exporter ("jsonl:<path>" or "otlp:<url>", empty to disable) and sampled fraction of requests
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+# SQLite file holding finished results by upload SHA-256 (empty to disable), and how many to keep
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", "data/results.sqlite3")
+RESULT_STORE_MAX_ENTRIES = int(os.getenv("RESULT_STORE_MAX_ENTRIES", "10000"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    supervisor = WorkerSupervisor(max_rss_mb=WORKER_MAX_RSS_MB, max_requests=WORKER_MAX_REQUESTS)
+    autotuner = Autotuner(
+        detect_limits().shared_by(WEB_CONCURRENCY),
+        min_workers=ANALYSIS_POOL_WORKERS or AUTOTUNE_MIN_WORKERS,
+        max_workers=ANALYSIS_POOL_WORKERS or AUTOTUNE_MAX_WORKERS,
+        min_admission=AUTOTUNE_MIN_ADMISSION,
+        max_admission=AUTOTUNE_MAX_ADMISSION,
+        target_queue_seconds=min(AUTOTUNE_TARGET_QUEUE_SECONDS, ANALYSIS_TIMEOUT_SECONDS),
+        interval=AUTOTUNE_INTERVAL_SECONDS,
+    )
+    logger.info(f"Analysis pool sizing: {'; '.join(autotuner.current.reasons)}")
+    app.state.analysis_pool = AnalysisPool(
+        max_pending=AUTOTUNE_MAX_ADMISSION, supervisor=supervisor, autotuner=autotuner
+    )
+    app.state.analytics = AnalyticsSink(ANALYTICS_DIR)
+    app.state.analytics.start()
+    app.state.results = ResultStore(
+        RESULT_STORE_PATH, ResumeAnalyzer.SCORING_VERSION, max_entries=RESULT_STORE_MAX_ENTRIES
+    ) if RESULT_STORE_PATH else None
+    tracer.configure(TRACE_SAMPLE_RATE, exporter_from_config(TRACE_EXPORT))
+    yield
+    app.state.analysis_pool.shutdown()
+    app.state.analytics.stop()
+    if app.state.results is not None:
+        app.state.results.close()
+    if tracer.exporter:
+        tracer.exporter.shutdown()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Resume Analyzer API",
     description="Analyze resumes and provide scores and feedback",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -29,7 +105,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["POST", "GET", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
+app.add_middleware(RequestTracingMiddleware)
 
 
 
@@ -40,7 +118,9 @@ async def root():
         "message": "Resume Analyzer API",
         "version": "1.0.0",
         "endpoints": {
-            "analyze": "POST /analyze - Upload and analyze a PDF resume"
+            "analyze": "POST /analyze - Upload and analyze a PDF, DOCX or plain-text resume",
+            "analyze_stream": "POST /analyze/stream - Same as /analyze, streamed as Server-Sent Events",
+            "analyze_lookup": "GET /analyze/{sha256} - Stored result for a previously analyzed file, or 404"
         }
     }
 
@@ -51,25 +131,108 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """Counters and timings collected since startup."""
+    return metrics.snapshot()
+
+
+@app.get("/admin/workers")
+async def worker_stats(request: Request):
+    """Per-worker memory, request count and extraction time, plus recycle history."""
+    pool = request.app.state.analysis_pool
+    return {"in_flight": pool.in_flight, **pool.supervisor.snapshot()}
+
+
+@app.get("/admin/autotune")
+async def autotune_state(request: Request):
+    """Resource limits, measured per-request cost, and the pool sizing decisions made from them."""
+    pool = request.app.state.analysis_pool
+    return {
+        "pool": {"workers": pool.max_workers, "admission_limit": pool.admission_limit, "in_flight": pool.in_flight},
+        **pool.autotuner.snapshot(),
+    }
+
+
+@app.get("/analytics/stats")
+async def analytics_stats(request: Request, top: int = 10):
+    """Aggregate statistics over all analyzed resumes, served from rollups."""
+    return request.app.state.analytics.stats(top_n=top)
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    with tracer.span("upload.read") as span:
+        file_content = await file.read()
+        span.set("bytes", len(file_content))
+    return file_content
+
+
+def _require_format(file_content: bytes, content_type: str) -> str:
+    """Sniff the upload format or reject it with a 400."""
+    file_format = sniff_format(file_content, content_type)
+    if file_format is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Only PDF, DOCX and plain-text files are allowed."
+        )
+    return file_format
+
+
+def _lookup_result(state: Any, digest: str, depth: str) -> Any:
+    """
+    Stored result for this upload hash and depth, counting hits and misses.
+    Blocks on SQLite, so async endpoints call it through run_in_threadpool.
+    """
+    if state.results is None:
+        return None
+    result = state.results.get(digest, depth)
+    metrics.increment("result_store.hit" if result else "result_store.miss")
+    return result
+
+
+def _remember_result(state: Any, digest: str, depth: str, result: Dict) -> None:
+    """Keep a freshly computed result for hash lookups and feed full ones to analytics."""
+    if state.results is not None:
+        state.results.put(digest, depth, result)
+    if depth == ResumeAnalyzer.FULL:
+        state.analytics.record(result)
+
+
+@app.get("/analyze/{sha256}", response_model=AnalysisResponse)
+async def lookup_analysis(request: Request, sha256: str, depth: Literal["quick", "full"] = "full"):
+    """
+    Return the stored result for a file the server has already analyzed,
+    identified by the lowercase hex SHA-256 of its bytes. A 404 means the
+    client should upload the file to POST /analyze.
+    """
+    sha256 = sha256.lower()
+    if not is_sha256(sha256):
+        raise HTTPException(status_code=400, detail="Expected a hex-encoded SHA-256 digest")
+
+    result = await run_in_threadpool(_lookup_result, request.app.state, sha256, depth)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Unknown file; upload it to POST /analyze")
+    return AnalysisResponse(**result)
+
+
 @app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_resume(file: UploadFile = File(...)):
+async def analyze_resume(
+    request: Request,
+    file: UploadFile = File(...),
+    depth: Literal["quick", "full"] = "full",
+):
     """
-    Analyze a PDF resume and return scores and feedback.
+    Analyze a PDF, DOCX or plain-text resume and return scores and feedback.
+    depth=quick is a cheap pre-screen: page 1 only, total score and field,
+    no strengths, weaknesses or ATS score.
     IMPORTANT:
     We ignore file.filename completely because Windows adds characters like ?\ that break Python.
-    We validate using file.content_type instead.
+    We validate by sniffing the file content (and file.content_type) instead.
     """
 
-    # SAFEST validation
-    if file.content_type not in ["application/pdf"]:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file type. Only PDF files are allowed."
-        )
-
     try:
         # Read file content into memory
-        file_content = await file.read()
+        file_content = await _read_upload(file)
 
         if len(file_content) == 0:
             raise HTTPException(
@@ -77,22 +240,42 @@ async def analyze_resume(file: UploadFile = File(...)):
                 detail="Uploaded file is empty"
             )
 
-        # Extract text from PDF bytes only
-        logger.info("Extracting text from uploaded PDF")
-        text = extract_text_from_pdf_bytes(file_content)
+        file_format = _require_format(file_content, file.content_type)
 
-        if not text or len(text.strip()) < 50:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract enough text. This PDF may be image-based or corrupted."
-            )
+        digest = hashlib.sha256(file_content).hexdigest()
+        cached = await run_in_threadpool(_lookup_result, request.app.state, digest, depth)
+        if cached:
+            return AnalysisResponse(**cached)
+
+        # Extract and analyze in a worker process; stops early on timeout or disconnect
+        logger.info(f"Analyzing uploaded {file_format} file...")
+        metrics.increment(f"uploads.{file_format}")
+        deadline = Deadline(ANALYSIS_TIMEOUT_SECONDS)
+        analysis_result = await request.app.state.analysis_pool.analyze(
+            file_content,
+            deadline,
+            is_disconnected=request.is_disconnected,
+            file_format=file_format,
+            depth=depth,
+        )
+
+        response = AnalysisResponse(**analysis_result)
+        await run_in_threadpool(_remember_result, request.app.state, digest, depth, response.model_dump())
+        return response
+
+    except HTTPException:
+        raise
 
-        # Analyze resume
-        logger.info("Analyzing resume...")
-        analyzer = ResumeAnalyzer(text)
-        analysis_result = analyzer.analyze()
+    except DeadlineExceeded as e:
+        logger.warning(f"Analysis stopped: {e.reason}")
+        raise HTTPException(
+            status_code=504,
+            detail=f"Analysis did not finish within {ANALYSIS_TIMEOUT_SECONDS:g} seconds. "
+                   "The PDF may be unusually large or complex."
+        )
 
-        return AnalysisResponse(**analysis_result)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
     except ValueError as e:
         logger.error(f"Value error: {str(e)}")
@@ -106,6 +289,94 @@ async def analyze_resume(file: UploadFile = File(...)):
         )
 
 
+def _sse(event: str, payload: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def _stream_analysis(
+    events: AsyncIterator[Tuple[str, Dict[str, Any]]],
+    on_result: Callable[[Dict], None],
+) -> AsyncIterator[str]:
+    """
+    Relay a pool job's events as SSE messages: one per extracted page and per
+    analyzer stage, then the result. Errors are reported as a final "error"
+    event because the 200 status line has already been sent.
+    """
+    try:
+        async for event, payload in events:
+            if event == "result":
+                payload = AnalysisResponse(**payload).model_dump()
+                await run_in_threadpool(on_result, payload)
+            yield _sse(event, payload)
+
+    except DeadlineExceeded as e:
+        logger.warning(f"Streaming analysis stopped: {e.reason}")
+        yield _sse("error", {
+            "status": 504,
+            "detail": f"Analysis did not finish within {ANALYSIS_TIMEOUT_SECONDS:g} seconds.",
+        })
+
+    except ValueError as e:
+        logger.error(f"Value error: {str(e)}")
+        yield _sse("error", {"status": 400, "detail": str(e)})
+
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        yield _sse("error", {
+            "status": 500,
+            "detail": f"An error occurred while processing the resume: {str(e)}",
+        })
+
+
+@app.post("/analyze/stream")
+async def analyze_resume_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    depth: Literal["quick", "full"] = "full",
+):
+    """
+    Analyze a PDF, DOCX or plain-text resume and stream progress as Server-Sent Events.
+
+    Events, in order: one "page" per extracted page (a single one for DOCX
+    and text), "sections", "field",
+    one "section_score" per scored section, "ats_readiness", and finally
+    "result" with the same body as POST /analyze (or "error"). A file the
+    server has already analyzed gets the stored "result" event only. The
+    analysis runs in the worker pool, so a full pool answers 503 up front.
+    """
+    file_content = await _read_upload(file)
+
+    if len(file_content) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Uploaded file is empty"
+        )
+
+    file_format = _require_format(file_content, file.content_type)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+    digest = hashlib.sha256(file_content).hexdigest()
+    cached = await run_in_threadpool(_lookup_result, request.app.state, digest, depth)
+    if cached:
+        return StreamingResponse(iter([_sse("result", cached)]), media_type="text/event-stream", headers=headers)
+
+    metrics.increment(f"uploads.{file_format}")
+    logger.info(f"Streaming analysis of uploaded {file_format} file")
+    # Runs in a pool worker like POST /analyze; a disconnect closes the stream, which cancels the job
+    deadline = Deadline(ANALYSIS_TIMEOUT_SECONDS)
+    try:
+        events = request.app.state.analysis_pool.stream(file_content, deadline, file_format=file_format, depth=depth)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    on_result = functools.partial(_remember_result, request.app.state, digest, depth)
+    return StreamingResponse(
+        _stream_analysis(events, on_result),
+        media_type="text/event-stream",
+        headers=headers,
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
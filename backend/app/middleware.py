@@ -0,0 +1,42 @@
+"""
+ASGI middleware for the Resume Analyzer API.
+"""
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.tracing import tracer
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class RequestTracingMiddleware:
+    """
+    Accepts an X-Request-ID from the client (or generates one), echoes it on
+    the response, and opens the root trace span for the request.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so streaming responses and
+    disconnect detection pass through untouched and the root span covers the
+    whole response body.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        request_id = request_id[:128]
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        with tracer.start_trace(request_id, name=f"{scope['method']} {scope['path']}") as root:
+            await self.app(scope, receive, send_with_request_id)
+            root.set("http.path", scope["path"])
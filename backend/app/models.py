@@ -1,7 +1,7 @@
 """
 Pydantic models for the Resume Analyzer API.
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -18,19 +18,29 @@ class AnalysisResponse(BaseModel):
     """Response model for resume analysis."""
     score: float = Field(..., ge=0, le=10, description="Total score out of 10")
     sections: SectionScores = Field(..., description="Individual section scores")
-    strengths: List[str] = Field(..., description="List of strengths identified")
-    weaknesses: List[str] = Field(..., description="List of weaknesses identified")
+    strengths: List[str] = Field(
+        default_factory=list,
+        description="List of strengths identified (empty for quick analyses)",
+    )
+    weaknesses: List[str] = Field(
+        default_factory=list,
+        description="List of weaknesses identified (empty for quick analyses)",
+    )
     detected_sections: Dict[str, bool] = Field(..., description="Which sections were detected")
-    ats_readiness: int = Field(
-        ...,
+    ats_readiness: Optional[int] = Field(
+        None,
         ge=0,
         le=100,
-        description="Approximate ATS-readiness score (0-100, higher is better)",
+        description="Approximate ATS-readiness score (0-100, higher is better); not computed for quick analyses",
     )
     field: Optional[str] = Field(
         None,
         description="Detected primary field of study/work (e.g., 'software / it', 'data / ai')",
     )
+    depth: Literal["quick", "full"] = Field(
+        "full",
+        description="Analysis depth: 'quick' scores page 1 only and skips feedback, 'full' runs everything",
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,556 @@
+"""
+Process pool that runs text extraction and analysis off the event loop.
+
+Each submitted job gets a slot in a shared byte array. Setting the slot to 1
+cancels the job: the worker's Deadline reads the flag before every page and
+analyzer stage, so a cancelled or timed-out request frees its core within one
+unit of work even though it runs in another process.
+
+Workers report their pid and resident memory with every result. A worker
+that has served its request limit, or whose memory grew past its limit,
+exits right after sending its result and the executor starts one fresh
+process in its place; the other workers keep running. A worker that dies
+(killed by the OOM killer, a crash in a parser) breaks its whole executor,
+so the pool starts a fresh executor for new jobs and lets the old one drain
+in the background. The same swap lets an Autotuner resize the pool; its
+admission limit caps how many jobs may be queued or running at once.
+
+Streaming jobs also send progress events (pages, analyzer stages) back while
+they run. Every worker shares one multiprocessing queue with the parent; a
+dispatcher thread hands each event to the stream waiting for that job id.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+# _sendback_result and _ExceptionWithTraceback are the stdlib worker loop's own
+# helpers; _worker_main reuses them to speak the executor's result protocol.
+from concurrent.futures.process import BrokenProcessPool, _ExceptionWithTraceback, _sendback_result
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import time
+
+from app.analyzer import ResumeAnalyzer
+from app.autotune import Autotuner
+from app.deadline import Deadline, DeadlineExceeded
+from app.metrics import metrics
+from app.supervisor import WorkerSupervisor
+from app.tracing import tracer
+from app.utils.formats import PDF, iter_pages
+
+logger = logging.getLogger(__name__)
+
+# Set in each worker process by _init_worker.
+_cancel_flags = None
+_events = None
+_max_rss_bytes: Optional[float] = None
+# Set by a job whose worker should exit once the job's result is sent
+_retiring = False
+
+
+class PoolSaturated(Exception):
+    """Raised when every job slot is taken and a new job cannot be admitted."""
+
+
+class _SharedFlag:
+    """threading.Event-like view of one slot in the shared cancel array."""
+
+    def __init__(self, flags, slot: int):
+        self._flags = flags
+        self._slot = slot
+
+    def is_set(self) -> bool:
+        return bool(self._flags[self._slot])
+
+    def set(self) -> None:
+        self._flags[self._slot] = 1
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, but good enough off Linux. ru_maxrss
+        # is in KB on Linux and in bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak * 1024 if sys.platform.startswith("linux") else peak
+
+
+def _init_worker(cancel_flags, events, max_rss_bytes: Optional[float] = None) -> None:
+    global _cancel_flags, _events, _max_rss_bytes
+    _cancel_flags = cancel_flags
+    _events = events
+    _max_rss_bytes = max_rss_bytes
+
+
+def _worker_main(call_queue, result_queue, initializer, initargs, max_tasks=None) -> None:
+    """
+    ProcessPoolExecutor's worker loop (concurrent.futures.process._process_worker),
+    except that a job can also retire its worker by setting _retiring. Either
+    way the worker exits after sending the result, with its pid attached, so
+    the executor replaces just this process instead of marking itself broken.
+    """
+    if initializer is not None:
+        try:
+            initializer(*initargs)
+        except BaseException:
+            logger.critical("Exception in analysis worker initializer", exc_info=True)
+            # The parent notices the process stopped and marks the pool broken
+            return
+    num_tasks = 0
+    while True:
+        call_item = call_queue.get(block=True)
+        if call_item is None:
+            # Executor shutdown; wake up its management thread
+            result_queue.put(os.getpid())
+            return
+
+        num_tasks += 1
+        try:
+            outcome = {"result": call_item.fn(*call_item.args, **call_item.kwargs)}
+        except BaseException as e:
+            outcome = {"exception": _ExceptionWithTraceback(e, e.__traceback__)}
+        retire = _retiring or (max_tasks is not None and num_tasks >= max_tasks)
+        exit_pid = os.getpid() if retire else None
+        _sendback_result(result_queue, call_item.work_id, exit_pid=exit_pid, **outcome)
+        del call_item, outcome
+        if retire:
+            return
+
+
+class _WorkerExecutor(ProcessPoolExecutor):
+    """ProcessPoolExecutor whose workers run _worker_main."""
+
+    def _spawn_process(self):
+        process = self._mp_context.Process(
+            target=_worker_main,
+            args=(self._call_queue, self._result_queue, self._initializer, self._initargs, self._max_tasks_per_child),
+        )
+        process.start()
+        self._processes[process.pid] = process
+
+
+def _emit(job_id: Optional[int], event: Optional[str], payload: Any) -> None:
+    """Send a progress event to the parent; only streaming jobs have a job id."""
+    if job_id is not None:
+        _events.put((job_id, event, payload))
+
+
+def _run_analysis(
+    file_content: bytes,
+    file_format: str,
+    slot: int,
+    expires_at: Optional[float],
+    trace_context: Optional[Tuple[str, str]] = None,
+    depth: str = ResumeAnalyzer.FULL,
+    job_id: Optional[int] = None,
+) -> Dict:
+    """
+    Worker entry point: extract text and analyze it under the job's deadline.
+    Quick analyses only extract the first page of a PDF. Stage timings and
+    trace spans are returned with the result so the parent can record them;
+    a failed job attaches its spans and worker pid to the exception as
+    `spans` and `pid`. A worker whose RSS ends a job above the limit it was
+    started with retires after that job.
+
+    With a job_id, every page and analyzer event except the result is also
+    sent to the parent as it happens, followed by an end marker (event None).
+    A "restart" event means PDF extraction fell back to another extractor
+    and the page events so far are superseded.
+    """
+    max_pages = 1 if depth == ResumeAnalyzer.QUICK else None
+    deadline = Deadline(expires_at=expires_at, cancel_event=_SharedFlag(_cancel_flags, slot))
+
+    try:
+        with tracer.remote(trace_context) as spans:
+            try:
+                with tracer.span("worker.analysis", pid=os.getpid(), format=file_format, bytes=len(file_content)):
+                    start = time.perf_counter()
+                    pages = []
+
+                    def on_extractor(name: str) -> None:
+                        if name == "pypdf2":
+                            pages.clear()
+                            _emit(job_id, "restart", {"extractor": name})
+
+                    pages_iter = iter_pages(file_content, file_format, deadline, max_pages, on_extractor)
+                    for page_number, page_text in pages_iter:
+                        if page_text:
+                            pages.append(page_text)
+                        _emit(job_id, "page", {"page": page_number, "characters": len(page_text)})
+                    text = "\n".join(pages)
+                    extracted = time.perf_counter()
+
+                    if not text or len(text.strip()) < 50:
+                        if file_format == PDF:
+                            raise ValueError("Could not extract enough text. This PDF may be image-based or corrupted.")
+                        raise ValueError("Could not extract enough text. The file may be empty or too short to analyze.")
+
+                    with tracer.span("analyze", characters=len(text), depth=depth):
+                        for event, payload in ResumeAnalyzer(text, deadline).iter_analysis(depth):
+                            if event == "result":
+                                result = payload
+                            else:
+                                _emit(job_id, event, payload)
+            except Exception as e:
+                # Exceptions pickle their __dict__, so the spans of a failed job reach the parent too
+                e.spans = spans
+                e.pid = os.getpid()
+                raise
+    finally:
+        _emit(job_id, None, None)
+
+    global _retiring
+    rss_bytes = _current_rss_bytes()
+    if _max_rss_bytes is not None and rss_bytes > _max_rss_bytes:
+        _retiring = True
+    return {
+        "result": result,
+        "extract_seconds": extracted - start,
+        "analyze_seconds": time.perf_counter() - extracted,
+        "pid": os.getpid(),
+        "rss_bytes": rss_bytes,
+        "spans": spans,
+    }
+
+
+class AnalysisPool:
+    """
+    Runs analysis jobs in worker processes with cooperative cancellation.
+
+    max_pending is the size of the shared cancel array and the most jobs that
+    may ever be queued or running at once. admission_limit (at most
+    max_pending) is the current limit; with an autotuner it and the worker
+    count follow the tuner's decisions.
+    """
+
+    POLL_INTERVAL = 0.1
+    # How long a finished streaming job's remaining events may lag its result
+    EVENTS_GRACE_SECONDS = 1.0
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: int = 64,
+        supervisor: Optional[WorkerSupervisor] = None,
+        autotuner: Optional[Autotuner] = None,
+    ):
+        self._context = multiprocessing.get_context("spawn")
+        self.autotuner = autotuner
+        if autotuner is not None:
+            max_workers = autotuner.current.workers
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.admission_limit = max_pending
+        if autotuner is not None:
+            self.set_admission_limit(autotuner.current.admission_limit)
+        self.supervisor = supervisor or WorkerSupervisor()
+        self._cancel_flags = self._context.Array("b", max_pending, lock=False)
+        self._free_slots = list(range(max_pending))
+        self._slots_lock = threading.Lock()
+        self._executor_lock = threading.Lock()
+        self._events = self._context.Queue()
+        self._listeners: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._job_ids = itertools.count()
+        self._dispatcher = threading.Thread(target=self._dispatch_events, name="analysis-events", daemon=True)
+        self._dispatcher.start()
+        self._generation = self.supervisor.generation
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return _WorkerExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._cancel_flags, self._events, self.supervisor.max_rss_bytes),
+            max_tasks_per_child=self.supervisor.max_requests,
+        )
+
+    def recycle(self) -> None:
+        """
+        Route new jobs to a fresh set of workers. The old executor finishes
+        its queued and running jobs, then its processes exit. Workers over
+        their own limits do not need this; they are replaced one at a time.
+        """
+        with self._executor_lock:
+            old_executor = self._executor
+            self._executor = self._new_executor()
+            self._generation = self.supervisor.generation
+        old_executor.shutdown(wait=False)
+
+    def resize(self, max_workers: int) -> None:
+        """Run new jobs on max_workers processes; current workers drain as in recycle()."""
+        if max_workers != self.max_workers:
+            self.supervisor.start_new_generation(f"resizing from {self.max_workers} to {max_workers} workers")
+            self.max_workers = max_workers
+            self.recycle()
+
+    def set_admission_limit(self, limit: int) -> None:
+        self.admission_limit = max(1, min(limit, self.max_pending))
+
+    def _apply_tuning(self) -> None:
+        decision = self.autotuner.maybe_decide(_current_rss_bytes())
+        if decision is not None:
+            self.set_admission_limit(decision.admission_limit)
+            self.resize(decision.workers)
+
+    def _worker_died(self, generation: int) -> None:
+        """Replace an executor that lost a worker; only the first job to notice does so."""
+        logger.warning(f"Analysis worker of generation {generation} died")
+        if self.supervisor.worker_died(generation):
+            self.recycle()
+
+    def _submit(self, *args) -> Tuple[int, Future]:
+        """Submit a job, replacing the executor first if a worker died since the last job."""
+        with self._executor_lock:
+            generation = self._generation
+            try:
+                return generation, self._executor.submit(_run_analysis, *args)
+            except BrokenProcessPool:
+                pass
+        self._worker_died(generation)
+        with self._executor_lock:
+            return self._generation, self._executor.submit(_run_analysis, *args)
+
+    def _acquire_slot(self) -> int:
+        with self._slots_lock:
+            if not self._free_slots or self.max_pending - len(self._free_slots) >= self.admission_limit:
+                raise PoolSaturated("Too many resumes are being analyzed right now. Please retry shortly.")
+            slot = self._free_slots.pop()
+        self._cancel_flags[slot] = 0
+        return slot
+
+    def _release_slot(self, slot: int) -> None:
+        with self._slots_lock:
+            self._free_slots.append(slot)
+
+    @property
+    def in_flight(self) -> int:
+        with self._slots_lock:
+            return self.max_pending - len(self._free_slots)
+
+    def _dispatch_events(self) -> None:
+        """Hand each worker event to the stream waiting for its job; runs until shutdown()."""
+        while True:
+            item = self._events.get()
+            if item is None:
+                return
+            job_id, event, payload = item
+            listener = self._listeners.get(job_id)
+            if listener is None:
+                continue
+            loop, inbox = listener
+            try:
+                loop.call_soon_threadsafe(inbox.put_nowait, (event, payload))
+            except RuntimeError:
+                # The stream's event loop is gone
+                self._listeners.pop(job_id, None)
+
+    def _start_job(
+        self, file_content: bytes, deadline: Deadline, file_format: str, depth: str, job_id: Optional[int] = None
+    ) -> Tuple[int, int, Future]:
+        """Admit and submit a job; returns its slot, generation and future."""
+        slot = self._acquire_slot()
+        try:
+            generation, job = self._submit(
+                file_content, file_format, slot, deadline.expires_at, tracer.current_context(), depth, job_id
+            )
+        except BaseException:
+            # No job owns the slot, so no done-callback will hand it back
+            self._release_slot(slot)
+            raise
+        # The slot may only be reused once the worker has let go of it.
+        job.add_done_callback(lambda _: self._release_slot(slot))
+        return slot, generation, job
+
+    async def analyze(
+        self,
+        file_content: bytes,
+        deadline: Deadline,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        file_format: str = PDF,
+        depth: str = ResumeAnalyzer.FULL,
+    ) -> Dict:
+        """
+        Analyze an upload in a worker process.
+
+        Raises DeadlineExceeded("timeout") when the deadline passes and
+        DeadlineExceeded("disconnected") when is_disconnected() reports that
+        the client went away; in both cases the worker is told to stop.
+        """
+        slot, generation, job = self._start_job(file_content, deadline, file_format, depth)
+        result: Dict = {}
+        async for _, result in self._follow(slot, generation, job, deadline, is_disconnected, file_format, depth):
+            pass
+        return result
+
+    def stream(
+        self,
+        file_content: bytes,
+        deadline: Deadline,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        file_format: str = PDF,
+        depth: str = ResumeAnalyzer.FULL,
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Like analyze(), but yields (event, payload) for every extracted page
+        and analyzer stage while the worker runs, ending with ("result",
+        result). The job is admitted before this returns, so PoolSaturated
+        is raised here rather than from the iterator. Closing the iterator
+        early cancels the job.
+        """
+        job_id = next(self._job_ids)
+        inbox: asyncio.Queue = asyncio.Queue()
+        self._listeners[job_id] = (asyncio.get_running_loop(), inbox)
+        try:
+            slot, generation, job = self._start_job(file_content, deadline, file_format, depth, job_id)
+        except BaseException:
+            del self._listeners[job_id]
+            raise
+        return self._follow(slot, generation, job, deadline, is_disconnected, file_format, depth, job_id, inbox)
+
+    async def _follow(
+        self,
+        slot: int,
+        generation: int,
+        job: Future,
+        deadline: Deadline,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+        file_format: str,
+        depth: str,
+        job_id: Optional[int] = None,
+        inbox: Optional[asyncio.Queue] = None,
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """Wait for a submitted job, relaying its events from inbox, and yield ("result", result) last."""
+        future = asyncio.wrap_future(job)
+        getter: Optional[asyncio.Future] = None
+        events_ended = inbox is None
+        reason = None
+        try:
+            while reason is None:
+                if not events_ended and getter is None:
+                    getter = asyncio.ensure_future(inbox.get())
+                remaining = deadline.remaining()
+                timeout = self.POLL_INTERVAL if remaining is None else min(self.POLL_INTERVAL, remaining)
+                waiting = {future} if events_ended else {future, getter}
+                done, _ = await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if getter is not None and getter in done:
+                    event, payload = getter.result()
+                    getter = None
+                    if event is None:
+                        events_ended = True
+                    else:
+                        yield event, payload
+                elif future in done:
+                    error: Optional[Exception] = None
+                    try:
+                        outcome = self._collect(future, generation, file_format, depth)
+                    except Exception as e:
+                        error = e
+                    # Events travel separately from the outcome; deliver the stragglers first
+                    while not events_ended:
+                        if getter is None:
+                            getter = asyncio.ensure_future(inbox.get())
+                        await asyncio.wait({getter}, timeout=self.EVENTS_GRACE_SECONDS)
+                        if not getter.done():
+                            logger.warning("Analysis events did not arrive before the outcome")
+                            break
+                        event, payload = getter.result()
+                        getter = None
+                        if event is None:
+                            events_ended = True
+                        else:
+                            yield event, payload
+                    if error is not None:
+                        raise error
+                    yield "result", outcome["result"]
+                    return
+
+                if deadline.expired():
+                    reason = "timeout"
+                elif deadline.cancelled:
+                    reason = "cancelled"
+                elif is_disconnected is not None and await is_disconnected():
+                    reason = "disconnected"
+
+            self._cancel(slot, generation, job, future, reason)
+            raise DeadlineExceeded(reason)
+        finally:
+            if getter is not None:
+                getter.cancel()
+            if job_id is not None:
+                self._listeners.pop(job_id, None)
+            if reason is None and not future.done():
+                # The caller stopped listening (stream closed, task cancelled)
+                self._cancel(slot, generation, job, future, "disconnected")
+
+    def _collect(self, future: asyncio.Future, generation: int, file_format: str, depth: str) -> Dict:
+        """Record a finished job's measurements and return its outcome, or raise its error."""
+        try:
+            outcome = future.result()
+        except Exception as e:
+            self._record_failure(generation, e)
+            if isinstance(e, DeadlineExceeded):
+                # The worker noticed the deadline before we did.
+                metrics.increment(f"analysis.cancelled.{e.reason}")
+            elif isinstance(e, BrokenProcessPool):
+                # This request is lost, but the next one gets working processes
+                self._worker_died(generation)
+            raise
+        metrics.observe(f"extract.{file_format}", outcome["extract_seconds"])
+        metrics.observe(f"analyze.{depth}", outcome["analyze_seconds"])
+        tracer.export(outcome["spans"])
+        self.supervisor.observe(generation, outcome["pid"], outcome["rss_bytes"], outcome["extract_seconds"])
+        if self.autotuner is not None:
+            self.autotuner.observe(outcome["extract_seconds"], outcome["analyze_seconds"], outcome["rss_bytes"])
+            self._apply_tuning()
+        return outcome
+
+    def _record_failure(self, generation: int, error: BaseException) -> None:
+        """Export a failed job's worker spans and count the job against its worker."""
+        tracer.export(getattr(error, "spans", []))
+        if hasattr(error, "pid"):
+            self.supervisor.observe(generation, error.pid, None, 0.0)
+
+    def _record_abandoned(self, generation: int, future: asyncio.Future) -> None:
+        """Done-callback for a job nobody waits for any more."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._record_failure(generation, error)
+            return
+        outcome = future.result()
+        tracer.export(outcome["spans"])
+        self.supervisor.observe(generation, outcome["pid"], outcome["rss_bytes"], outcome["extract_seconds"])
+
+    def _cancel(self, slot: int, generation: int, job: Future, future: asyncio.Future, reason: str) -> None:
+        """Tell the worker to stop and stop waiting for it."""
+        with self._slots_lock:
+            # Once the job is done its slot may already belong to another job
+            if not job.done():
+                _SharedFlag(self._cancel_flags, slot).set()
+        job.cancel()
+        # Nobody awaits the result any more; retrieve it so asyncio does not
+        # log the worker's DeadlineExceeded as unhandled, and keep its spans
+        # and its count towards the worker's request limit.
+        future.add_done_callback(lambda f: self._record_abandoned(generation, f))
+
+        logger.info(f"Analysis cancelled ({reason})")
+        metrics.increment(f"analysis.cancelled.{reason}")
+
+    def shutdown(self) -> None:
+        for slot in range(self.max_pending):
+            self._cancel_flags[slot] = 1
+        with self._executor_lock:
+            executor = self._executor
+        executor.shutdown(wait=True, cancel_futures=True)
+        self._events.put(None)
+        self._dispatcher.join()
@@ -0,0 +1,220 @@
+"""
+Field-aware scoring profiles.
+
+A profile is a JSON file in app/scoring_profiles/ named after the field it
+scores (e.g. "software / it" -> software-it.json). It holds the keywords
+that identify a resume of that field, the field's skill vocabulary, the
+keywords that count as technical detail in project descriptions, and the
+thresholds analyze_skills/analyze_projects apply. default.json is used when
+no field was detected or the field has no file. Adding a field is adding a
+file.
+
+Nothing is read at startup. detect_field reads every profile's detection
+keywords the first time it runs. A profile's scoring vocabulary is loaded
+and compiled into a KeywordMatcher the first time a resume of that field is
+scored, and compiled profiles are kept in a bounded LRU cache, so adding
+fields costs neither startup time nor time on requests for other fields.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = os.path.join(os.path.dirname(__file__), "scoring_profiles")
+DEFAULT_PROFILE = "default"
+
+
+def profile_slug(field: str) -> str:
+    """File stem for a field name: "software / it" -> "software-it"."""
+    return re.sub(r"[^a-z0-9]+", "-", field.lower()).strip("-")
+
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed set of keywords occur in a text, as substrings,
+    in one pass.
+
+    The keywords are compiled into a trie-shaped regex, so each position
+    costs at most the length of the longest keyword no matter how many
+    keywords there are. At every position the regex finds the longest keyword
+    starting there. Keywords that are substrings of that one (e.g. "java"
+    inside "javascript") are credited too, which gives the same answer as
+    testing `keyword in text` for every keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({kw.lower() for kw in keywords if kw})
+        self._pattern = re.compile(f"(?=({self._trie_pattern(self.keywords)}))") if self.keywords else None
+        self._contained = {
+            kw: {other for other in self.keywords if other in kw} for kw in self.keywords
+        }
+
+    @staticmethod
+    def _trie_pattern(keywords: List[str]) -> str:
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+
+        def build(node: Dict) -> str:
+            branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            # Greedy optional: prefer the longer keyword, fall back to the one ending here
+            return f"(?:{body})?" if "" in node else body
+
+        return build(trie)
+
+    def find(self, text: str) -> Set[str]:
+        """The keywords that occur in text (which should already be lowercase)."""
+        if self._pattern is None:
+            return set()
+        found: Set[str] = set()
+        for longest in set(self._pattern.findall(text)):
+            found |= self._contained[longest]
+        return found
+
+
+class ScoringProfile:
+    """Vocabulary and thresholds for scoring resumes of one field."""
+
+    THRESHOLDS = {
+        # analyze_skills: fewer listed skills than this is a weakness...
+        "min_skill_count": 5,
+        # ...and at least this many is a strength
+        "good_skill_count": 10,
+        # analyze_skills: distinct vocabulary hits for full / partial credit
+        "strong_keyword_hits": 5,
+        "some_keyword_hits": 3,
+        # analyze_projects: project keyword hits for full credit
+        "strong_project_mentions": 3,
+    }
+
+    def __init__(
+        self,
+        name: str,
+        skills: Iterable[str],
+        project_keywords: Iterable[str],
+        thresholds: Optional[Dict[str, int]] = None,
+    ):
+        unknown = set(thresholds or {}) - set(self.THRESHOLDS)
+        if unknown:
+            raise ValueError(f"Unknown thresholds in profile {name}: {sorted(unknown)}")
+        self.name = name
+        self.skills = KeywordMatcher(skills)
+        self.project_keywords = KeywordMatcher(project_keywords)
+        self.thresholds = {**self.THRESHOLDS, **(thresholds or {})}
+
+    def __getitem__(self, threshold: str) -> int:
+        return self.thresholds[threshold]
+
+    @classmethod
+    def from_file(cls, path: str) -> "ScoringProfile":
+        with open(path) as f:
+            data = json.load(f)
+        try:
+            return cls(
+                data.get("field", os.path.splitext(os.path.basename(path))[0]),
+                data["skills"],
+                data.get("project_keywords", []),
+                data.get("thresholds"),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid scoring profile {path}: {e}") from e
+
+
+class ProfileRegistry:
+    """
+    Loads and compiles profiles on first use and keeps the most recently
+    used `cache_size` of them. Safe to share between threads.
+    """
+
+    def __init__(self, directory: str = PROFILES_DIR, cache_size: int = 32):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, ScoringProfile]" = OrderedDict()
+        self._field_keywords: Optional[Dict[str, List[str]]] = None
+        self._lock = threading.Lock()
+
+    def field_keywords(self) -> Dict[str, List[str]]:
+        """
+        Detection keywords by field name for every profile in the directory
+        that has them, in file name order. Read once, on the first call.
+        """
+        with self._lock:
+            if self._field_keywords is not None:
+                return self._field_keywords
+
+        field_keywords: Dict[str, List[str]] = {}
+        for name in sorted(os.listdir(self.directory)):
+            slug, ext = os.path.splitext(name)
+            if ext != ".json" or slug == DEFAULT_PROFILE:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                keywords = [kw.lower() for kw in data.get("detection_keywords", [])]
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                logger.error(f"Skipping scoring profile {path} for field detection: {e}")
+                continue
+            if keywords:
+                field_keywords[data.get("field", slug)] = keywords
+        with self._lock:
+            self._field_keywords = field_keywords
+        return field_keywords
+
+    def get(self, field: Optional[str]) -> ScoringProfile:
+        """The profile for `field`, or the default profile."""
+        slug = profile_slug(field) if field else DEFAULT_PROFILE
+        with self._lock:
+            profile = self._cache.get(slug)
+            if profile is not None:
+                self._cache.move_to_end(slug)
+                self.hits += 1
+                return profile
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent miss for the same field just compiles twice
+        profile = self._load(slug)
+        with self._lock:
+            self._cache[slug] = profile
+            self._cache.move_to_end(slug)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return profile
+
+    def _load(self, slug: str) -> ScoringProfile:
+        path = os.path.join(self.directory, f"{slug}.json")
+        if slug != DEFAULT_PROFILE:
+            if not os.path.exists(path):
+                return self.get(None)
+            try:
+                return ScoringProfile.from_file(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"Falling back to the default scoring profile: {e}")
+                return self.get(None)
+        return ScoringProfile.from_file(path)
+
+    def cache_info(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+                "cached": list(self._cache),
+            }
+
+
+profiles = ProfileRegistry()
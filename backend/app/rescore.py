@@ -0,0 +1,250 @@
+"""
+Bulk export and re-scoring over a corpus file (see app/corpus.py).
+
+    export   extract every PDF, DOCX and TXT file in an archive directory
+             once and write the text into a corpus file
+    run      score every record in a corpus with the current analyzer
+
+Re-scoring never touches the original files. Worker processes each map the
+corpus once and are handed ranges of record numbers, so text goes straight
+from the shared mapping into ResumeAnalyzer with no per-record file I/O
+and no text crossing process boundaries. A record the analyzer fails on is
+reported as an error like a record without text. A worker crash loses the
+ranges in flight; they are re-run on fresh workers, and a range that
+crashes a worker of its own is reported as errors. Results can be written as JSON
+lines and/or into the result store, which refreshes hash lookups after a
+SCORING_VERSION bump. Only full results are stored: the server computes
+quick results from page 1 alone, and the corpus holds the whole text.
+
+Usage (from the backend directory):
+    python -m app.rescore export --archive ./archive --output data/corpus.bin
+    python -m app.rescore run --corpus data/corpus.bin --output results.jsonl \
+        --result-store data/results.sqlite3
+"""
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+from app.analyzer import ResumeAnalyzer
+from app.corpus import CorpusReader, CorpusWriter
+from app.result_store import ResultStore
+from app.utils.formats import extract_document, sniff_format
+
+logger = logging.getLogger(__name__)
+
+_CONTENT_TYPES = {".pdf": "application/pdf", ".txt": "text/plain", ".docx": "application/octet-stream"}
+
+# Set in each re-scoring worker by _open_corpus
+_reader: Optional[CorpusReader] = None
+
+# A range of records handed to a worker: (start, stop, executor, future)
+_Submitted = Tuple[int, int, ProcessPoolExecutor, Future]
+
+
+def _extract_file(path: str) -> Optional[Tuple[str, str, int, str]]:
+    """Export worker: (sha256, text, page count, extractor), or None if the file has no usable text."""
+    content = Path(path).read_bytes()
+    file_format = sniff_format(content, _CONTENT_TYPES[Path(path).suffix.lower()])
+    if not file_format:
+        return None
+    try:
+        text, page_count, extractor = extract_document(content, file_format)
+    except ValueError as e:
+        logger.warning(f"Skipping {path}: {e}")
+        return None
+    return hashlib.sha256(content).hexdigest(), text, page_count, extractor
+
+
+def export(archive_dir: str, output: str, workers: Optional[int] = None) -> Dict:
+    """Extract every supported file under archive_dir into a corpus at output."""
+    paths = [str(p) for p in sorted(Path(archive_dir).rglob("*")) if p.suffix.lower() in _CONTENT_TYPES]
+    skipped = duplicates = 0
+    start = time.perf_counter()
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor, CorpusWriter(output) as writer:
+        for extracted in executor.map(_extract_file, paths, chunksize=8):
+            if extracted is None:
+                skipped += 1
+            elif not writer.add(*extracted):
+                duplicates += 1
+        records = len(writer)
+
+    return {
+        "files": len(paths),
+        "records": records,
+        "skipped": skipped,
+        "duplicates": duplicates,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _open_corpus(path: str) -> None:
+    global _reader
+    _reader = CorpusReader(path)
+
+
+def _score_range(start: int, stop: int, depth: str) -> List[Dict]:
+    """Re-scoring worker: analyze records start..stop-1 of the mapped corpus."""
+    scored = []
+    for i in range(start, stop):
+        sha256 = _reader.record(i).sha256
+        text = _reader.text(i)
+        if len(text.strip()) < 50:
+            scored.append({"sha256": sha256, "error": "Not enough text to analyze"})
+            continue
+        try:
+            scored.append({"sha256": sha256, "result": ResumeAnalyzer(text).analyze(depth)})
+        except Exception as e:
+            logger.warning(f"Failed to score {sha256}: {e!r}")
+            scored.append({"sha256": sha256, "error": f"Analysis failed: {e!r}"})
+    return scored
+
+
+def rescore(
+    corpus_path: str,
+    depth: str = ResumeAnalyzer.FULL,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+) -> Iterator[Dict]:
+    """
+    Yield {"sha256", "result"} (or {"sha256", "error"}) for every record, in
+    corpus order. At most two ranges per worker are outstanding at a time, so
+    memory stays bounded however large the corpus is. If a worker dies, the
+    unfinished ranges are resubmitted to fresh workers, and each range that
+    was lost is re-run in a process of its own; a range that crashes that
+    process too yields an error for each of its records.
+    """
+    context = multiprocessing.get_context("spawn")
+
+    def new_executor(max_workers: Optional[int] = workers) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=context, initializer=_open_corpus, initargs=(corpus_path,)
+        )
+
+    with CorpusReader(corpus_path) as reader:
+        count = len(reader)
+        ranges = ((start, min(start + chunk_size, count)) for start in range(0, count, chunk_size))
+        window = 2 * (workers or os.cpu_count() or 1)
+
+        def submit(start: int, stop: int) -> _Submitted:
+            try:
+                future = executor.submit(_score_range, start, stop, depth)
+            except BrokenProcessPool:
+                replace_broken_executor()
+                future = executor.submit(_score_range, start, stop, depth)
+            return start, stop, executor, future
+
+        def replace_broken_executor() -> None:
+            """Start fresh workers and resubmit the ranges the dead ones had not finished."""
+            nonlocal executor
+            logger.warning("A re-scoring worker died; resubmitting its unfinished ranges to fresh workers")
+            broken, executor = executor, new_executor()
+            broken.shutdown(wait=False)
+            entries = list(pending)
+            pending.clear()
+            for entry in entries:
+                lost = entry[2] is broken and entry[3].exception() is not None
+                pending.append(submit(entry[0], entry[1]) if lost else entry)
+
+        def score_alone(start: int, stop: int) -> List[Dict]:
+            """Re-run a range lost to a worker crash in its own process, so only the culprit fails."""
+            with new_executor(1) as single:
+                try:
+                    return single.submit(_score_range, start, stop, depth).result()
+                except BrokenProcessPool:
+                    logger.error(f"Records {start}-{stop - 1} crash the worker; skipping them")
+                    return [
+                        {"sha256": reader.record(i).sha256, "error": "Worker process died"} for i in range(start, stop)
+                    ]
+
+        executor = new_executor()
+        pending: Deque[_Submitted] = deque()
+        pending.extend(submit(start, stop) for start, stop in islice(ranges, window))
+        try:
+            while pending:
+                start, stop, submitted_to, future = pending.popleft()
+                try:
+                    scored = future.result()
+                except BrokenProcessPool:
+                    if submitted_to is executor:
+                        replace_broken_executor()
+                    scored = score_alone(start, stop)
+                for start, stop in islice(ranges, 1):
+                    pending.append(submit(start, stop))
+                yield from scored
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Extract an archive of resumes into a corpus file")
+    export_parser.add_argument("--archive", required=True, help="Directory of PDF, DOCX or TXT resumes (searched recursively)")
+    export_parser.add_argument("--output", required=True, help="Corpus file to write")
+    export_parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPUs)")
+
+    run_parser = commands.add_parser("run", help="Score every record of a corpus file")
+    run_parser.add_argument("--corpus", required=True)
+    run_parser.add_argument("--depth", choices=ResumeAnalyzer.DEPTHS, default=ResumeAnalyzer.FULL)
+    run_parser.add_argument("--workers", type=int, default=None, help="Analysis processes (default: CPUs)")
+    run_parser.add_argument("--chunk-size", type=int, default=64, help="Records handed to a worker at a time")
+    run_parser.add_argument("--output", help="Write one JSON result per line here")
+    run_parser.add_argument("--result-store", help="Also store results in this SQLite result store (full depth only)")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        print(json.dumps(export(args.archive, args.output, args.workers), indent=2))
+        return
+
+    if args.result_store and args.depth == ResumeAnalyzer.QUICK:
+        # The server scores quick results from page 1 only, but corpus
+        # records hold every page, so these would not match its answers
+        parser.error("--result-store only accepts full results; quick results need page-1 text")
+
+    store = ResultStore(args.result_store, ResumeAnalyzer.SCORING_VERSION) if args.result_store else None
+    output = open(args.output, "w") if args.output else None
+    scored = failed = 0
+    start = time.perf_counter()
+    try:
+        for record in rescore(args.corpus, args.depth, args.workers, args.chunk_size):
+            if "error" in record:
+                failed += 1
+            else:
+                scored += 1
+                if store:
+                    store.put(record["sha256"], args.depth, record["result"])
+            if output:
+                output.write(json.dumps(record) + "\n")
+    finally:
+        if output:
+            output.close()
+        if store:
+            store.close()
+
+    elapsed = time.perf_counter() - start
+    json.dump({
+        "scored": scored,
+        "failed": failed,
+        "seconds": elapsed,
+        "records_per_second": (scored + failed) / elapsed if elapsed else None,
+        "scoring_version": ResumeAnalyzer.SCORING_VERSION,
+    }, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
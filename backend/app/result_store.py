@@ -0,0 +1,81 @@
+"""
+Store of finished analysis results, keyed by the SHA-256 of the uploaded file.
+
+Lets clients ask "do you already know this file?" before uploading it, and
+lets repeat uploads skip extraction and analysis. Only results are stored,
+never the uploaded file. Backed by SQLite so every uvicorn worker on the host
+shares it.
+"""
+from typing import Dict, Optional
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_sha256(value: str) -> bool:
+    return bool(_SHA256.match(value))
+
+
+class ResultStore:
+    """
+    (sha256, depth, scoring version) -> analysis result, bounded to
+    max_entries (oldest entries are dropped first). Results computed by an
+    older scoring version are never returned.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, scoring_version: int, max_entries: int = 10000):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.scoring_version = scoring_version
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " sha256 TEXT NOT NULL, depth TEXT NOT NULL, version INTEGER NOT NULL,"
+            " result TEXT NOT NULL, created_at REAL NOT NULL,"
+            " PRIMARY KEY (sha256, depth, version))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at)")
+
+    def get(self, sha256: str, depth: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM results WHERE sha256 = ? AND depth = ? AND version = ?",
+                (sha256, depth, self.scoring_version),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, sha256: str, depth: str, result: Dict) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (sha256, depth, version, result, created_at) VALUES (?, ?, ?, ?, ?)",
+                (sha256, depth, self.scoring_version, json.dumps(result), time.time()),
+            )
+            self._puts += 1
+            if self._puts % self.PRUNE_EVERY == 0:
+                self._prune()
+
+    def _prune(self) -> None:
+        self._db.execute(
+            "DELETE FROM results WHERE version != ? OR rowid IN"
+            " (SELECT rowid FROM results ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.scoring_version, self.max_entries),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,170 @@
+"""
+Health supervision for analysis pool workers.
+
+Every finished job reports the worker's pid, resident memory and extraction
+time. The supervisor keeps per-worker stats and flags workers whose memory
+keeps growing with each request. A worker that crosses the configured memory
+or request limit exits after its job and is replaced on its own; a worker
+that dies, or a resize, starts a new generation of workers.
+"""
+from typing import Dict, Optional
+import logging
+import threading
+import time
+
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerStats:
+    """Running totals for one worker process."""
+
+    def __init__(self, pid: int, generation: int):
+        self.pid = pid
+        self.generation = generation
+        self.started_at = time.time()
+        self.requests = 0
+        self.extract_seconds = 0.0
+        self.rss_bytes = 0
+        self.peak_rss_bytes = 0
+        self.baseline_rss_bytes: Optional[int] = None
+
+    def rss_growth_per_request(self) -> float:
+        """Average RSS growth per request since the first one, in bytes."""
+        if self.baseline_rss_bytes is None or self.requests < 2:
+            return 0.0
+        return (self.rss_bytes - self.baseline_rss_bytes) / (self.requests - 1)
+
+    def to_dict(self, leak_threshold_bytes: float, leak_min_requests: int) -> Dict:
+        growth = self.rss_growth_per_request()
+        return {
+            "pid": self.pid,
+            "generation": self.generation,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "extract_seconds_total": round(self.extract_seconds, 3),
+            "rss_mb": round(self.rss_bytes / 2**20, 1),
+            "peak_rss_mb": round(self.peak_rss_bytes / 2**20, 1),
+            "rss_growth_per_request_kb": round(growth / 1024, 1),
+            "suspected_leak": self.requests >= leak_min_requests and growth > leak_threshold_bytes,
+        }
+
+
+class WorkerSupervisor:
+    """
+    Tracks the health of the analysis pool's workers.
+
+    observe() is called with each job's worker report and returns True when
+    the worker crossed max_rss_mb or max_requests; that worker exits after
+    the job (the pool's executor enforces the same limits) and its stats are
+    dropped. Reports from workers of an older generation (still draining
+    after a worker death or resize) are ignored.
+    """
+
+    def __init__(
+        self,
+        max_rss_mb: float = 512,
+        max_requests: int = 1000,
+        leak_threshold_kb: float = 256,
+        leak_min_requests: int = 20,
+    ):
+        self.max_rss_bytes = max_rss_mb * 2**20
+        self.max_requests = max_requests
+        self.leak_threshold_bytes = leak_threshold_kb * 1024
+        self.leak_min_requests = leak_min_requests
+        self.generation = 0
+        self.recycles = 0
+        self.worker_deaths = 0
+        self.last_recycle_reason: Optional[str] = None
+        self._workers: Dict[int, WorkerStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, generation: int, pid: int, rss_bytes: Optional[int], extract_seconds: float) -> bool:
+        """
+        Record one job run by worker pid. Failed jobs report no rss_bytes but
+        still count towards max_requests, as they do for the executor.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return False
+
+            stats = self._workers.get(pid)
+            if stats is None:
+                stats = self._workers[pid] = WorkerStats(pid, generation)
+            stats.requests += 1
+            stats.extract_seconds += extract_seconds
+            if rss_bytes is not None:
+                stats.rss_bytes = rss_bytes
+                stats.peak_rss_bytes = max(stats.peak_rss_bytes, rss_bytes)
+                if stats.baseline_rss_bytes is None:
+                    stats.baseline_rss_bytes = rss_bytes
+
+            if rss_bytes is not None and rss_bytes > self.max_rss_bytes:
+                reason = f"worker {pid} RSS {rss_bytes / 2**20:.0f} MB over limit"
+            elif stats.requests >= self.max_requests:
+                reason = f"worker {pid} served {stats.requests} requests"
+            else:
+                return False
+
+            logger.info(f"Replacing analysis worker: {reason}")
+            self._warn_if_leaking(stats)
+            del self._workers[pid]
+            self.recycles += 1
+            self.last_recycle_reason = reason
+            metrics.increment("workers.recycled")
+            return True
+
+    def worker_died(self, generation: int) -> bool:
+        """
+        Record that a worker exited abruptly, which breaks its whole executor.
+        Returns True for the first report from the current generation, when
+        the pool should replace the executor; later reports are ignored.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return False
+            self.worker_deaths += 1
+            metrics.increment("workers.died")
+            self._start_new_generation("a worker process died")
+            return True
+
+    def start_new_generation(self, reason: str) -> None:
+        """Forget the current workers, e.g. because the pool is being resized."""
+        with self._lock:
+            self._start_new_generation(reason)
+
+    def _start_new_generation(self, reason: str) -> None:
+        logger.info(f"Recycling analysis workers: {reason}")
+        for stats in self._workers.values():
+            self._warn_if_leaking(stats)
+        self._workers = {}
+        self.generation += 1
+        self.recycles += 1
+        self.last_recycle_reason = reason
+        metrics.increment("workers.recycled")
+
+    def _warn_if_leaking(self, stats: WorkerStats) -> None:
+        growth = stats.rss_growth_per_request()
+        if stats.requests >= self.leak_min_requests and growth > self.leak_threshold_bytes:
+            logger.warning(
+                f"Worker {stats.pid} grew {growth / 1024:.0f} KB per request over "
+                f"{stats.requests} requests; possible leak"
+            )
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "generation": self.generation,
+                "recycles": self.recycles,
+                "worker_deaths": self.worker_deaths,
+                "last_recycle_reason": self.last_recycle_reason,
+                "limits": {
+                    "max_rss_mb": self.max_rss_bytes / 2**20,
+                    "max_requests": self.max_requests,
+                },
+                "workers": [
+                    stats.to_dict(self.leak_threshold_bytes, self.leak_min_requests)
+                    for stats in self._workers.values()
+                ],
+            }
@@ -0,0 +1,312 @@
+"""
+Lightweight request tracing.
+
+Each request gets a trace (keyed by its request id) and nested spans for the
+upload, extractor attempts, pages and analyzer stages. Sampling is decided
+once per request at the edge; unsampled requests get a shared no-op span, so
+instrumented code costs one context-variable lookup per span.
+
+Spans finished inside a pool worker are collected in the worker and shipped
+back with the job result, then exported by the parent process. Exporters run
+on a background thread and write either JSON lines or OTLP/HTTP JSON.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+_HEX32 = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _new_id(length: int) -> str:
+    return os.urandom(length // 2).hex()
+
+
+class Span:
+    """One timed operation with attributes."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(16)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span when the request is not sampled."""
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# The innermost open span of the current request, or None when not sampled
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+# Inside a pool worker, finished spans are collected here instead of exported
+_collected: ContextVar[Optional[List[Dict]]] = ContextVar("collected_spans", default=None)
+
+
+class BackgroundExporter:
+    """Batches span dicts on a background thread; subclasses implement _write."""
+
+    def __init__(self, batch_size: int = 256, flush_interval: float = 1.0, max_queue: int = 10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def submit(self, spans: List[Dict]) -> None:
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                return
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.warning(f"Dropping {len(batch)} spans: {e}")
+
+    def _write(self, batch: List[Dict]) -> None:
+        raise NotImplementedError
+
+
+class JsonLinesExporter(BackgroundExporter):
+    """Appends one JSON object per span to a local file."""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(**kwargs)
+
+    def _write(self, batch: List[Dict]) -> None:
+        with open(self.path, "a") as f:
+            f.write("".join(json.dumps(span, separators=(",", ":")) + "\n" for span in batch))
+
+
+def _otlp_value(value: Any) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(batch: List[Dict], service_name: str = "resume-analyzer") -> Dict:
+    """Convert span dicts to an OTLP/HTTP JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": "app.tracing"},
+                "spans": [
+                    {
+                        "traceId": span["trace_id"],
+                        "spanId": span["span_id"],
+                        "parentSpanId": span["parent_id"] or "",
+                        "name": span["name"],
+                        "kind": 1,
+                        "startTimeUnixNano": str(span["start_ns"]),
+                        "endTimeUnixNano": str(span["end_ns"]),
+                        "attributes": [
+                            {"key": key, "value": _otlp_value(value)}
+                            for key, value in span["attributes"].items()
+                        ],
+                    }
+                    for span in batch
+                ],
+            }],
+        }]
+    }
+
+
+class OtlpHttpExporter(BackgroundExporter):
+    """POSTs batches to an OTLP/HTTP JSON endpoint, e.g. http://collector:4318/v1/traces."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0, **kwargs):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def _write(self, batch: List[Dict]) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(to_otlp(batch)).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def exporter_from_config(spec: str) -> Optional[BackgroundExporter]:
+    """Build an exporter from "jsonl:<path>" or "otlp:<url>"; "" disables tracing."""
+    if not spec:
+        return None
+    kind, _, target = spec.partition(":")
+    if kind == "jsonl":
+        return JsonLinesExporter(target)
+    if kind == "otlp":
+        return OtlpHttpExporter(target)
+    raise ValueError(f"Unknown trace exporter: {spec}")
+
+
+class Tracer:
+    """Creates spans for sampled requests and hands finished spans to the exporter."""
+
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional[BackgroundExporter] = None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def configure(self, sample_rate: float, exporter: Optional[BackgroundExporter]) -> None:
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def should_sample(self) -> bool:
+        return self.exporter is not None and random.random() < self.sample_rate
+
+    @contextmanager
+    def start_trace(self, request_id: str, name: str, sampled: Optional[bool] = None) -> Iterator[Any]:
+        """Open the root span of a request. The request id doubles as trace id when it is 32 hex chars."""
+        if sampled is None:
+            sampled = self.should_sample()
+        if not sampled:
+            yield _NOOP_SPAN
+            return
+
+        trace_id = request_id if _HEX32.match(request_id) else _new_id(32)
+        root = Span(name, trace_id, None, {"request.id": request_id})
+        token = _current_span.set(root)
+        try:
+            yield root
+        finally:
+            _current_span.reset(token)
+            self._finish(root)
+
+    @contextmanager
+    def span(self, name: str, parent: Any = None, **attributes) -> Iterator[Any]:
+        """
+        Open a child of the current span (or of `parent`) and make it current.
+        A no-op when the request is not sampled.
+        """
+        if not isinstance(parent, Span):
+            parent = _current_span.get()
+        if parent is None:
+            yield _NOOP_SPAN
+            return
+
+        span = Span(name, parent.trace_id, parent.span_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+
+    def start_span(self, name: str, **attributes) -> Any:
+        """
+        Start a child of the current span without making it current. For spans
+        that stay open across generator yields; close with end_span().
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP_SPAN
+        return Span(name, parent.trace_id, parent.span_id, attributes)
+
+    def end_span(self, span: Any) -> None:
+        if isinstance(span, Span):
+            self._finish(span)
+
+    def current_context(self) -> Optional[Tuple[str, str]]:
+        """(trace_id, span_id) to hand to a worker process, or None if not sampled."""
+        span = _current_span.get()
+        return (span.trace_id, span.span_id) if span else None
+
+    @contextmanager
+    def remote(self, context: Optional[Tuple[str, str]]) -> Iterator[List[Dict]]:
+        """
+        Continue a trace inside a worker process. Spans finished in the block
+        are collected into the yielded list for the parent to export.
+        """
+        spans: List[Dict] = []
+        if context is None:
+            yield spans
+            return
+
+        trace_id, parent_id = context
+        placeholder = Span("remote-parent", trace_id, None, {})
+        placeholder.span_id = parent_id
+        span_token = _current_span.set(placeholder)
+        collect_token = _collected.set(spans)
+        try:
+            yield spans
+        finally:
+            _collected.reset(collect_token)
+            _current_span.reset(span_token)
+
+    def export(self, spans: List[Dict]) -> None:
+        if spans and self.exporter is not None:
+            self.exporter.submit(spans)
+
+    def _finish(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        collected = _collected.get()
+        if collected is not None:
+            collected.append(span.to_dict())
+        elif self.exporter is not None:
+            self.exporter.submit([span.to_dict()])
+
+
+tracer = Tracer()
@@ -0,0 +1,74 @@
+"""
+DOCX text extraction for the Resume Analyzer.
+
+A .docx file is a zip container; the body text lives in word/document.xml.
+That one member is streamed through an incremental XML parser, and parsed
+paragraphs are detached from the tree, so neither the rest of the archive
+nor the whole XML tree is ever held in memory.
+"""
+
+from typing import Iterator, Optional
+import logging
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+
+from app.deadline import Deadline, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCUMENT_XML = "word/document.xml"
+# Uncompressed size limit for document.xml, to refuse zip bombs up front
+MAX_DOCUMENT_XML_BYTES = 50 * 1024 * 1024
+# How many paragraphs to parse between deadline checks
+_DEADLINE_CHECK_EVERY = 200
+
+
+def iter_docx_paragraphs(docx_bytes: bytes, deadline: Optional[Deadline] = None) -> Iterator[str]:
+    """Yield the text of each paragraph of a DOCX document, in order."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(docx_bytes)) as archive:
+            info = archive.getinfo(_DOCUMENT_XML)
+            if info.file_size > MAX_DOCUMENT_XML_BYTES:
+                raise ValueError("DOCX document is too large to analyze.")
+
+            with archive.open(info) as document:
+                parts = []
+                paragraphs = 0
+                body = None
+                for event, element in ET.iterparse(document, events=("start", "end")):
+                    tag = element.tag
+                    if event == "start":
+                        if tag == _W + "body":
+                            body = element
+                        continue
+                    if tag == _W + "t":
+                        parts.append(element.text or "")
+                    elif tag == _W + "tab":
+                        parts.append("\t")
+                    elif tag in (_W + "br", _W + "cr"):
+                        parts.append("\n")
+                    elif tag == _W + "p":
+                        yield "".join(parts)
+                        parts = []
+                        paragraphs += 1
+                        if deadline and paragraphs % _DEADLINE_CHECK_EVERY == 0:
+                            deadline.check()
+                        # Drop the finished paragraph subtree, and detach finished
+                        # paragraphs and tables from the body, to keep memory flat.
+                        # An open table detached here keeps being parsed; only
+                        # its own subtree lives until it ends.
+                        element.clear()
+                        if body is not None:
+                            del body[:]
+    except (DeadlineExceeded, ValueError):
+        raise
+    except (KeyError, RuntimeError, zipfile.BadZipFile, ET.ParseError) as e:
+        logger.error(f"DOCX extraction failed: {e}")
+        raise ValueError("Failed to extract text from DOCX. The file may be corrupted.")
+
+
+def extract_text_from_docx_bytes(docx_bytes: bytes, deadline: Optional[Deadline] = None) -> str:
+    """Extract text from a DOCX entirely in memory, one line per paragraph."""
+    return "\n".join(p for p in iter_docx_paragraphs(docx_bytes, deadline) if p.strip())
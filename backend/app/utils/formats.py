@@ -0,0 +1,115 @@
+"""
+Upload format detection and routing to the cheapest extractor.
+
+Sniffing trusts the file's magic bytes over the browser-supplied content
+type, so a DOCX sent as application/octet-stream still avoids the PDF path.
+"""
+
+from typing import Callable, Iterator, Optional, Tuple
+
+from app.deadline import Deadline
+from app.tracing import tracer
+from app.utils.docx_extractor import extract_text_from_docx_bytes
+from app.utils.pdf_extractor import iter_pdf_pages
+from app.utils.text_extractor import extract_text_from_text_bytes
+
+PDF = "pdf"
+DOCX = "docx"
+TEXT = "text"
+
+SUPPORTED_FORMATS = (PDF, DOCX, TEXT)
+
+_TEXT_CONTENT_TYPES = {"application/octet-stream", "application/x-empty", ""}
+
+
+def _looks_like_text(sample: bytes) -> bool:
+    """
+    Binary formats are full of NUL bytes; text in any 8-bit encoding has
+    none. The text extractor picks the encoding (UTF-8, else Latin-1).
+    """
+    return b"\x00" not in sample
+
+
+def sniff_format(file_content: bytes, content_type: Optional[str]) -> Optional[str]:
+    """Return PDF, DOCX or TEXT for an upload, or None if it is unsupported."""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    head = file_content[:1024]
+
+    if head.startswith(b"PK\x03\x04"):
+        return DOCX
+    # The PDF header may legally be preceded by junk within the first 1 KB,
+    # but a text file that merely mentions "%PDF-" is still text
+    pdf_offset = head.find(b"%PDF-")
+    if pdf_offset == 0 or (
+        pdf_offset > 0 and (content_type == "application/pdf" or not _looks_like_text(head[:pdf_offset]))
+    ):
+        return PDF
+    if content_type == "application/pdf":
+        # Let the PDF extractor produce its usual "corrupted" error
+        return PDF
+    if (content_type.startswith("text/") or content_type in _TEXT_CONTENT_TYPES) and _looks_like_text(file_content[:4096]):
+        return TEXT
+    return None
+
+
+def iter_pages(
+    file_content: bytes,
+    file_format: str,
+    deadline: Optional[Deadline] = None,
+    max_pages: Optional[int] = None,
+    on_extractor: Optional[Callable[[str], None]] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_number, text) for an upload. PDFs are yielded page by page
+    (at most max_pages); DOCX and text have no pages and come back as a
+    single page. on_extractor is passed to iter_pdf_pages: when it is
+    called with "pypdf2", the pages yielded so far are superseded.
+    """
+    if file_format == PDF:
+        yield from iter_pdf_pages(file_content, deadline, max_pages, on_extractor)
+    elif file_format == DOCX:
+        with tracer.span("extract.docx", bytes=len(file_content)) as span:
+            text = extract_text_from_docx_bytes(file_content, deadline)
+            span.set("characters", len(text))
+        yield 1, text
+    elif file_format == TEXT:
+        with tracer.span("extract.text", bytes=len(file_content)) as span:
+            text = extract_text_from_text_bytes(file_content)
+            span.set("characters", len(text))
+        yield 1, text
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+
+def extract_text(
+    file_content: bytes,
+    file_format: str,
+    deadline: Optional[Deadline] = None,
+    max_pages: Optional[int] = None,
+) -> str:
+    """Extract the text of an upload of the given format."""
+    texts = []
+    for _, text in iter_pages(file_content, file_format, deadline, max_pages, lambda _: texts.clear()):
+        if text:
+            texts.append(text)
+    return "\n".join(texts)
+
+
+def extract_document(file_content: bytes, file_format: str, deadline: Optional[Deadline] = None) -> Tuple[str, int, str]:
+    """
+    Extract the whole text of an upload together with its page count and
+    the extractor that produced it ("pdfplumber", "pypdf2", "docx" or "text").
+    """
+    extractor, page_count = file_format, 0
+    texts = []
+
+    def on_extractor(name: str) -> None:
+        nonlocal extractor, page_count
+        extractor, page_count = name, 0
+        texts.clear()
+
+    for page_number, text in iter_pages(file_content, file_format, deadline, on_extractor=on_extractor):
+        page_count = page_number
+        if text:
+            texts.append(text)
+    return "\n".join(texts), page_count, extractor
@@ -3,52 +3,105 @@ Safe PDF extraction utility for the Resume Analyzer.
 Extracts only from bytes and never relies on file paths.
 """
 
-from typing import Optional
+from itertools import islice
+from typing import Callable, Iterator, Optional, Tuple
 import logging
 import io
 
 import pdfplumber
 from PyPDF2 import PdfReader
 
+from app.deadline import Deadline, DeadlineExceeded
+from app.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
 
-def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> Optional[str]:
+def iter_pdf_pages(
+    pdf_bytes: bytes,
+    deadline: Optional[Deadline] = None,
+    max_pages: Optional[int] = None,
+    on_extractor: Optional[Callable[[str], None]] = None,
+) -> Iterator[Tuple[int, str]]:
     """
-    Extract text from a PDF entirely in memory.
-    No file paths. No filename checks.
-    Fully safe against weird Windows paths like 'resume?\'.
+    Yield (page_number, page_text) for each page as soon as it is extracted.
+    Uses pdfplumber first and falls back to PyPDF2, like
+    extract_text_from_pdf_bytes. Pages without text are yielded with "".
+    If a deadline is given it is checked before every page; max_pages stops
+    after the first N pages. on_extractor is called with "pdfplumber" or
+    "pypdf2" as each attempt starts. If pdfplumber fails part way through,
+    PyPDF2 starts over from page 1: callers that collect pages must drop
+    the ones they got before on_extractor("pypdf2").
     """
 
     # Try pdfplumber first
+    found_text = False
+    if on_extractor:
+        on_extractor("pdfplumber")
+    attempt = tracer.start_span("extract.pdfplumber", bytes=len(pdf_bytes))
     try:
-        text_content = []
         with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
+            attempt.set("pages", len(pdf.pages))
+            for page_number, page in enumerate(islice(pdf.pages, max_pages), start=1):
+                if deadline:
+                    deadline.check()
+                with tracer.span("extract.page", parent=attempt, page=page_number) as page_span:
+                    page_text = page.extract_text() or ""
+                    page_span.set("characters", len(page_text))
                 if page_text:
-                    text_content.append(page_text)
+                    found_text = True
+                yield page_number, page_text
 
-        if text_content:
-            return "\n".join(text_content)
+        if found_text:
+            return
+    except DeadlineExceeded:
+        raise
     except Exception as e:
+        attempt.set("error", str(e))
         logger.warning(f"pdfplumber failed, trying PyPDF2. Reason: {e}")
+    finally:
+        tracer.end_span(attempt)
 
     # Fallback: PyPDF2
+    found_text = False
+    if on_extractor:
+        on_extractor("pypdf2")
+    attempt = tracer.start_span("extract.pypdf2", bytes=len(pdf_bytes))
     try:
         reader = PdfReader(io.BytesIO(pdf_bytes))
-        text_content = []
-        for page in reader.pages:
-            page_text = page.extract_text() or ""
+        attempt.set("pages", len(reader.pages))
+        for page_number, page in enumerate(islice(reader.pages, max_pages), start=1):
+            if deadline:
+                deadline.check()
+            with tracer.span("extract.page", parent=attempt, page=page_number) as page_span:
+                page_text = page.extract_text() or ""
+                page_span.set("characters", len(page_text))
             if page_text:
-                text_content.append(page_text)
-
-        if text_content:
-            return "\n".join(text_content)
+                found_text = True
+            yield page_number, page_text
 
         # If no text found
-        raise ValueError("No extractable text found in the PDF.")
+        if not found_text:
+            raise ValueError("No extractable text found in the PDF.")
 
+    except DeadlineExceeded:
+        raise
     except Exception as e:
+        attempt.set("error", str(e))
         logger.error(f"Both extractors failed: {e}")
         raise ValueError("Failed to extract text from PDF. It may be scanned or corrupted.")
+    finally:
+        tracer.end_span(attempt)
+
+
+def extract_text_from_pdf_bytes(pdf_bytes: bytes, deadline: Optional[Deadline] = None) -> Optional[str]:
+    """
+    Extract text from a PDF entirely in memory.
+    No file paths. No filename checks.
+    Fully safe against weird Windows paths like 'resume?\'.
+    """
+    texts = []
+    for _, text in iter_pdf_pages(pdf_bytes, deadline, on_extractor=lambda _: texts.clear()):
+        if text:
+            texts.append(text)
+    return "\n".join(texts)
@@ -0,0 +1,16 @@
+"""
+Plain-text "extraction" for the Resume Analyzer.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def extract_text_from_text_bytes(text_bytes: bytes) -> str:
+    """Decode an uploaded text file. UTF-8 (with or without BOM), else Latin-1."""
+    try:
+        return text_bytes.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        logger.info("Text upload is not UTF-8, decoding as Latin-1")
+        return text_bytes.decode("latin-1")
@@ -0,0 +1,54 @@
+"""
+Input shaping applied to extracted text before it reaches the analyzer.
+
+Garbage uploads can extract to megabytes of text, single lines tens of
+thousands of characters long, or huge runs of blank space. shape_text()
+bounds all three, so the analyzer's cost depends on these limits and not
+on the upload. Ordinary resumes are far below every limit and pass through
+unchanged.
+"""
+import re
+
+# Roughly 30 pages of dense text; anything longer is scored as "too long" anyway
+MAX_TEXT_CHARS = 100_000
+# Longer lines are split at a space (or hard-split) into lines of at most this length
+MAX_LINE_CHARS = 1_000
+# Runs of spaces/tabs are cut to this many characters. Runs of three or more
+# must survive, because the ATS check counts them to detect column layouts.
+MAX_SPACE_RUN = 16
+# Consecutive blank lines beyond this are dropped
+MAX_BLANK_LINES = 2
+
+_LINE_ENDINGS = re.compile(r"\r\n?")
+_SPACE_RUN = re.compile(rf"[^\S\n]{{{MAX_SPACE_RUN + 1},}}")
+_BLANK_LINES = re.compile(rf"\n(?:[^\S\n]*\n){{{MAX_BLANK_LINES + 1},}}")
+
+
+def _split_long_line(line: str, limit: int) -> str:
+    """Break a line into pieces of at most `limit` characters, preferring spaces."""
+    pieces = []
+    start = 0
+    while len(line) - start > limit:
+        cut = line.rfind(" ", start + limit // 2, start + limit)
+        if cut == -1:
+            pieces.append(line[start:start + limit])
+            start += limit
+        else:
+            pieces.append(line[start:cut])
+            start = cut + 1
+    pieces.append(line[start:])
+    return "\n".join(pieces)
+
+
+def shape_text(text: str) -> str:
+    """
+    Cap the text at MAX_TEXT_CHARS, normalize line endings, cut long runs of
+    spaces and blank lines, and split lines longer than MAX_LINE_CHARS.
+    """
+    text = _LINE_ENDINGS.sub("\n", text[:MAX_TEXT_CHARS])
+    text = _SPACE_RUN.sub(lambda m: m.group()[:MAX_SPACE_RUN], text)
+    text = _BLANK_LINES.sub("\n" * (MAX_BLANK_LINES + 1), text)
+    lines = text.split("\n")
+    if any(len(line) > MAX_LINE_CHARS for line in lines):
+        text = "\n".join(_split_long_line(line, MAX_LINE_CHARS) for line in lines)
+    return text
@@ -0,0 +1,129 @@
+"""
+Fuzz and adversarial latency benchmark for ResumeAnalyzer.
+
+Times a full analysis (input shaping included) of two kinds of input:
+
+- hand-written worst cases, one per known hazard: megabytes of text, long
+  digit and word runs, huge blocks of blank or '#' lines, very long lines;
+- random "token soup" built from resume fragments and those same hazards,
+  at sizes from a few characters up to --max-chars.
+
+Reports p50/p95/p99/max analysis time and the slowest inputs, and exits
+non-zero when p99 exceeds --budget-ms, so it can gate changes to the
+analyzer's patterns.
+
+Usage (from the backend directory):
+    python -m benchmarks.adversarial --cases 500 --budget-ms 500
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import random
+import sys
+import time
+
+from app.analyzer import ResumeAnalyzer
+
+from benchmarks.stats import latency_summary
+
+_RESUME = (
+    "Jane Doe\njane@example.com | +1 555-123-4567\n\n"
+    "Skills\npython, sql, docker, react, aws\n\n"
+    "Experience\nEngineer, Acme 2019-2021\n- Improved latency by 40% for 5000 users\n\n"
+    "Education\nBachelor of Science, State University 2018\n\n"
+    "Projects\n- Resume parser (github.com/jane/parser)\n"
+)
+
+# Fragments the fuzzer strings together: ordinary resume pieces plus the
+# building blocks of every input that has been slow in the past.
+_FRAGMENTS: List[Callable[[random.Random], str]] = [
+    lambda r: r.choice(["skills", "experience", "education", "projects", "certifications", "contact"]),
+    lambda r: r.choice(["\n", " ", "\t", ":", "#", ",", "-", "•", "*", "|", "@", ".", "$", "%", "+", "(", ")"]),
+    lambda r: r.choice(["python", "Led", "Improved", "University", "Bachelor", "jan", "present", "users"]),
+    lambda r: r.choice(["2019-2021", "2020 - present", "50%", "$100", "10+", "5 users", "a@b.co", "555-123-4567"]),
+    lambda r: "".join(r.choice("0123456789") for _ in range(r.randint(1, 50))),
+    lambda r: "1" * r.randint(100, 20_000),
+    lambda r: "a" * r.randint(100, 20_000),
+    lambda r: r.choice([" ", "\t", "\xa0"]) * r.randint(100, 20_000),
+    lambda r: "\n" * r.randint(10, 20_000),
+    lambda r: r.choice(["#\n", " \n", "-\n", "1.\n", "# \n"]) * r.randint(10, 5_000),
+    lambda r: ("x@" * r.randint(10, 5_000)),
+    lambda r: "".join(chr(r.randint(0x20, 0x2FFF)) for _ in range(r.randint(1, 200))),
+]
+
+
+def adversarial_cases(max_chars: int) -> List[Tuple[str, str]]:
+    """(name, text) for each hand-written worst case."""
+    half = max_chars // 2
+    return [
+        ("megabytes_of_text", _RESUME * (max_chars // len(_RESUME))),
+        ("digit_run_in_experience", _RESUME.replace("Engineer", "1" * half)),
+        ("word_run_without_at", _RESUME + "a" * half),
+        ("at_separated_words", _RESUME + "ab@" * (half // 3)),
+        ("blank_lines_before_header", _RESUME.replace("Skills", "\n" * half + "Skills")),
+        ("hash_lines_before_header", _RESUME.replace("Skills", "#\n" * (half // 2) + "Skills")),
+        ("space_run", _RESUME + " " * half),
+        ("single_long_line", _RESUME.replace("\n", " ") * (max_chars // len(_RESUME))),
+        ("bullets_without_text", _RESUME.replace("Projects\n", "Projects\n" + "-\n" * (half // 2))),
+        ("digits_then_spaces", _RESUME.replace("2019-2021", "2019" + " " * half + "-")),
+    ]
+
+
+def fuzz_case(rnd: random.Random, max_chars: int) -> str:
+    """Random token soup with a log-uniform target length up to max_chars."""
+    target = int(10 ** rnd.uniform(1, len(str(max_chars)) - 1))
+    parts: List[str] = []
+    size = 0
+    while size < target:
+        part = rnd.choice(_FRAGMENTS)(rnd)
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)[:max_chars]
+
+
+def time_analysis(text: str, depth: str) -> float:
+    start = time.perf_counter()
+    ResumeAnalyzer(text).analyze(depth)
+    return time.perf_counter() - start
+
+
+def run(cases: int, max_chars: int, depth: str, seed: int) -> Dict:
+    rnd = random.Random(seed)
+    inputs = adversarial_cases(max_chars)
+    inputs += [(f"fuzz_{i}", fuzz_case(rnd, max_chars)) for i in range(cases)]
+
+    timings = [(time_analysis(text, depth), name, len(text)) for name, text in inputs]
+    slowest = sorted(timings, reverse=True)[:10]
+    return {
+        "inputs": len(inputs),
+        "depth": depth,
+        "max_chars": max_chars,
+        "seed": seed,
+        "latency_seconds": latency_summary([t for t, _, _ in timings]),
+        "slowest": [{"name": name, "characters": chars, "seconds": t} for t, name, chars in slowest],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=500, help="Random fuzz inputs on top of the fixed worst cases")
+    parser.add_argument("--max-chars", type=int, default=2_000_000, help="Largest input to generate")
+    parser.add_argument("--depth", choices=ResumeAnalyzer.DEPTHS, default=ResumeAnalyzer.FULL)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-ms", type=float, default=500, help="Fail when p99 analysis time exceeds this")
+    args = parser.parse_args(argv)
+
+    # Warm up imports and regex caches so the first input is not penalized
+    time_analysis(_RESUME, args.depth)
+
+    report = run(args.cases, args.max_chars, args.depth, args.seed)
+    p99_ms = report["latency_seconds"]["p99"] * 1000
+    report["budget_ms"] = args.budget_ms
+    report["within_budget"] = p99_ms <= args.budget_ms
+    print(json.dumps(report, indent=2))
+    if not report["within_budget"]:
+        sys.exit(f"p99 analysis time {p99_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Compare quick and full analysis: throughput multiple and accuracy delta.
+
+Runs extraction plus ResumeAnalyzer in-process for every file in a corpus
+(PDF, DOCX or TXT), once at depth=quick and once at depth=full, and reports
+documents per second for each depth together with how far the quick score
+and field drift from the full result.
+
+Quick mode only differs from full on documents with more than one page, so
+the report counts multi-page documents. --as-pdf renders every TXT file as
+a PDF of --lines-per-page lines per page first, which turns a folder of
+plain-text resumes into a multi-page PDF corpus.
+
+Usage (from the backend directory):
+    python -m benchmarks.analysis_depth --corpus ./resumes --repeat 3
+    python -m benchmarks.analysis_depth --corpus ./resumes-txt --as-pdf --lines-per-page 30
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import time
+
+from app.analyzer import ResumeAnalyzer
+from app.utils.formats import PDF, TEXT, extract_document, extract_text, sniff_format
+from app.utils.text_extractor import extract_text_from_text_bytes
+
+from benchmarks.stats import percentile
+
+_CONTENT_TYPES = {".pdf": "application/pdf", ".txt": "text/plain", ".docx": "application/octet-stream"}
+
+
+def text_to_pdf(text: str, lines_per_page: int = 40) -> bytes:
+    """Render plain text as a minimal PDF, one Helvetica text line per line of input."""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages)))}] "
+        f"/Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for i, page_lines in enumerate(pages):
+        rows = "".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj T* "
+            for line in page_lines
+        )
+        stream = f"BT /F1 10 Tf 13 TL 50 760 Td {rows}ET".encode("latin-1", errors="replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+def load_corpus(corpus_dir: str, as_pdf: bool = False, lines_per_page: int = 40) -> List[Tuple[str, bytes, str]]:
+    """(name, bytes, format) for every supported file in corpus_dir, TXT rendered as PDF if as_pdf."""
+    documents = []
+    for path in sorted(Path(corpus_dir).iterdir()):
+        if path.suffix.lower() not in _CONTENT_TYPES:
+            continue
+        content = path.read_bytes()
+        file_format = sniff_format(content, _CONTENT_TYPES[path.suffix.lower()])
+        if file_format == TEXT and as_pdf:
+            content, file_format = text_to_pdf(extract_text_from_text_bytes(content), lines_per_page), PDF
+        if file_format:
+            documents.append((path.name, content, file_format))
+    if not documents:
+        raise SystemExit(f"No PDF, DOCX or TXT files found in {corpus_dir}")
+    return documents
+
+
+def run_depth(documents: List[Tuple[str, bytes, str]], depth: str, repeat: int) -> Tuple[float, Dict[str, Dict]]:
+    """Analyze every document `repeat` times; return (docs/sec, results by name)."""
+    max_pages = 1 if depth == ResumeAnalyzer.QUICK else None
+    results: Dict[str, Dict] = {}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, content, file_format in documents:
+            try:
+                text = extract_text(content, file_format, max_pages=max_pages)
+                results[name] = ResumeAnalyzer(text).analyze(depth)
+            except ValueError:
+                results[name] = None
+    elapsed = time.perf_counter() - start
+
+    return len(documents) * repeat / elapsed, results
+
+
+def compare(quick: Dict[str, Optional[Dict]], full: Dict[str, Optional[Dict]]) -> Dict:
+    """Accuracy of quick relative to full, over documents both could analyze."""
+    names = [name for name in full if full[name] and quick.get(name)]
+    score_deltas = [abs(quick[n]["score"] - full[n]["score"]) for n in names]
+    field_matches = sum(1 for n in names if quick[n]["field"] == full[n]["field"])
+    section_deltas = {
+        section: sum(abs(quick[n]["sections"][section] - full[n]["sections"][section]) for n in names) / len(names)
+        for section in full[names[0]]["sections"]
+    } if names else {}
+
+    return {
+        "documents": len(names),
+        "score_abs_delta_mean": sum(score_deltas) / len(names) if names else None,
+        "score_abs_delta_p95": percentile(score_deltas, 95),
+        "score_abs_delta_max": max(score_deltas) if names else None,
+        "field_agreement": field_matches / len(names) if names else None,
+        "section_abs_delta_mean": section_deltas,
+    }
+
+
+def page_counts(documents: List[Tuple[str, bytes, str]]) -> Dict[str, int]:
+    """How many documents have one page and how many have more."""
+    pages = []
+    for _, content, file_format in documents:
+        try:
+            pages.append(extract_document(content, file_format)[1])
+        except ValueError:
+            pass
+    return {"single_page": sum(1 for p in pages if p <= 1), "multi_page": sum(1 for p in pages if p > 1)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Directory of PDF, DOCX or TXT resumes")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per depth")
+    parser.add_argument("--as-pdf", action="store_true", help="Render TXT files as PDFs before measuring")
+    parser.add_argument("--lines-per-page", type=int, default=40, help="Lines per rendered PDF page")
+    args = parser.parse_args(argv)
+
+    documents = load_corpus(args.corpus, args.as_pdf, args.lines_per_page)
+    # Warm up imports and regex caches so the first depth is not penalized
+    run_depth(documents[:1], ResumeAnalyzer.FULL, 1)
+
+    quick_rate, quick_results = run_depth(documents, ResumeAnalyzer.QUICK, args.repeat)
+    full_rate, full_results = run_depth(documents, ResumeAnalyzer.FULL, args.repeat)
+
+    print(json.dumps({
+        "documents": len(documents),
+        "formats": {f: sum(1 for d in documents if d[2] == f) for f in {d[2] for d in documents}},
+        "pages": page_counts(documents),
+        "throughput_docs_per_second": {"quick": quick_rate, "full": full_rate},
+        "throughput_multiple": quick_rate / full_rate,
+        "accuracy": compare(quick_results, full_results),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Load-testing harness for the Resume Analyzer API.
+
+Starts app.main:app locally with uvicorn, replays a corpus of PDFs against
+POST /analyze at a controlled open-loop arrival rate, and sweeps uvicorn
+worker counts, client concurrency limits and arrival rates. Writes a JSON
+report with throughput, latency percentiles, error rates and the
+saturation knee of every (workers, concurrency) pair. The server runs with
+the result store disabled, so every request pays for extraction and
+analysis.
+
+Arrivals are scheduled ahead of time (Poisson process) and latency is
+measured from the scheduled arrival, so a slow server cannot throttle the
+generator and hide its own queueing delay.
+
+Usage (from the backend directory):
+    python -m benchmarks.loadtest --corpus ./resumes --workers 1,2,4 \\
+        --concurrency 16,64 --rates 1,2,4,8,16 --duration 30 --output report.json
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.stats import find_knee, latency_summary
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_corpus(corpus_dir: str) -> List[bytes]:
+    """Read every PDF in corpus_dir into memory."""
+    paths = sorted(Path(corpus_dir).glob("*.pdf"))
+    if not paths:
+        raise SystemExit(f"No PDF files found in {corpus_dir}")
+    return [path.read_bytes() for path in paths]
+
+
+def start_server(port: int, workers: int, pool_workers: Optional[int] = None) -> subprocess.Popen:
+    """Start uvicorn serving app.main:app and wait until /health answers."""
+    env = dict(os.environ)
+    # Every corpus file repeats; without this, repeats are answered from the result store
+    env["RESULT_STORE_PATH"] = ""
+    # Each uvicorn process sizes its pool for its share of the machine
+    env["WEB_CONCURRENCY"] = str(workers)
+    if pool_workers:
+        env["ANALYSIS_POOL_WORKERS"] = str(pool_workers)
+
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+
+    stop_server(process)
+    raise RuntimeError("uvicorn did not become healthy within 60 seconds")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def run_level(
+    base_url: str,
+    corpus: Sequence[bytes],
+    rate: float,
+    concurrency: int,
+    duration: float,
+    timeout: float = 120.0,
+    seed: int = 0,
+) -> Dict:
+    """
+    Offer `rate` requests per second for `duration` seconds with at most
+    `concurrency` requests in flight, and summarize the outcome.
+    """
+    rng = random.Random(seed)
+    arrivals = []
+    at = rng.expovariate(rate)
+    while at < duration:
+        arrivals.append(at)
+        at += rng.expovariate(rate)
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    in_flight = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+
+        async def send(index: int, scheduled: float) -> None:
+            pdf = corpus[index % len(corpus)]
+            async with in_flight:
+                try:
+                    response = await client.post(
+                        "/analyze",
+                        files={"file": (f"resume-{index}.pdf", pdf, "application/pdf")},
+                    )
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == "200":
+                latencies.append(time.perf_counter() - start - scheduled)
+
+        tasks = []
+        for index, scheduled in enumerate(arrivals):
+            delay = scheduled - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(index, scheduled)))
+
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    sent = len(arrivals)
+    errors = sent - len(latencies)
+    return {
+        "offered_rate": rate,
+        "concurrency": concurrency,
+        "sent": sent,
+        "completed": len(latencies),
+        "errors": errors,
+        "error_rate": errors / sent if sent else 0.0,
+        "statuses": statuses,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": latency_summary(latencies),
+    }
+
+
+def sweep(args: argparse.Namespace) -> Dict:
+    corpus = load_corpus(args.corpus)
+    runs = []
+    knees = []
+
+    worker_counts = [None] if args.url else args.workers
+    for workers in worker_counts:
+        server = None
+        base_url = args.url
+        if not base_url:
+            server = start_server(args.port, workers, args.pool_workers)
+            base_url = f"http://127.0.0.1:{args.port}"
+
+        try:
+            for concurrency in args.concurrency:
+                level_runs = []
+                for rate in args.rates:
+                    print(f"workers={workers} concurrency={concurrency} rate={rate}/s ...", file=sys.stderr)
+                    result = asyncio.run(run_level(
+                        base_url, corpus, rate, concurrency, args.duration, seed=args.seed
+                    ))
+                    result["workers"] = workers
+                    level_runs.append(result)
+
+                runs.extend(level_runs)
+                knee = find_knee(level_runs, args.p99_slo, args.max_error_rate)
+                knees.append({
+                    "workers": workers,
+                    "concurrency": concurrency,
+                    "knee_rate": knee["offered_rate"] if knee else None,
+                    "throughput": knee["throughput"] if knee else None,
+                    "p99": knee["latency"]["p99"] if knee else None,
+                })
+        finally:
+            if server:
+                stop_server(server)
+
+    return {
+        "config": {
+            "corpus_size": len(corpus),
+            "duration": args.duration,
+            "p99_slo": args.p99_slo,
+            "max_error_rate": args.max_error_rate,
+            "pool_workers": args.pool_workers,
+            "url": args.url,
+        },
+        "runs": runs,
+        "knees": knees,
+    }
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",")]
+
+
+def _float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",")]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Directory of PDF resumes to replay")
+    parser.add_argument("--workers", type=_int_list, default=[1], help="uvicorn worker counts, e.g. 1,2,4")
+    parser.add_argument("--pool-workers", type=int, default=None, help="ANALYSIS_POOL_WORKERS for each server")
+    parser.add_argument("--concurrency", type=_int_list, default=[32], help="Client in-flight limits, e.g. 8,32")
+    parser.add_argument("--rates", type=_float_list, default=[1, 2, 4, 8], help="Arrival rates in requests/s")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of arrivals per level")
+    parser.add_argument("--p99-slo", type=float, default=2.0, help="p99 latency limit for the knee, in seconds")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Error rate limit for the knee")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the locally started server")
+    parser.add_argument("--url", default=None, help="Target an already running server instead")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the arrival schedule")
+    parser.add_argument("--output", default="-", help="Report path, or - for stdout")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(sweep(args), indent=2)
+    if args.output == "-":
+        print(report)
+    else:
+        Path(args.output).write_text(report)
+
+
+if __name__ == "__main__":
+    main()
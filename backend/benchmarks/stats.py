@@ -0,0 +1,53 @@
+"""
+Small statistics helpers shared by the benchmark scripts.
+"""
+from typing import Dict, List, Optional, Sequence
+import math
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (pct in 0-100). Returns None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(latencies: Sequence[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/max of a list of latencies, in seconds."""
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else None,
+    }
+
+
+def find_knee(
+    runs: List[Dict],
+    p99_slo: float,
+    max_error_rate: float = 0.01,
+    min_goodput_ratio: float = 0.9,
+) -> Optional[Dict]:
+    """
+    Return the run with the highest offered rate that is still healthy.
+
+    A run is healthy when its p99 latency is within p99_slo seconds, its
+    error rate is at most max_error_rate, and it completed at least
+    min_goodput_ratio of the offered rate. Runs are scanned in order of
+    offered rate and the scan stops at the first unhealthy run, so the
+    result is the last rate before saturation.
+    """
+    knee = None
+    for run in sorted(runs, key=lambda r: r["offered_rate"]):
+        healthy = (
+            run["latency"]["p99"] is not None
+            and run["latency"]["p99"] <= p99_slo
+            and run["error_rate"] <= max_error_rate
+            and run["throughput"] >= min_goodput_ratio * run["offered_rate"]
+        )
+        if not healthy:
+            break
+        knee = run
+    return knee
@@ -0,0 +1,67 @@
+"""
+Tests for the analytics sink and rollups.
+"""
+from app.analytics import AnalyticsRollup, AnalyticsSink, make_record
+
+
+def _result(score, field, ats, weaknesses):
+    return {"score": score, "field": field, "ats_readiness": ats, "weaknesses": weaknesses}
+
+
+def test_rollup_counts_and_histograms():
+    """Rollups aggregate per field and group weaknesses that differ only in numbers."""
+    rollup = AnalyticsRollup()
+    rollup.add(make_record(_result(7.5, "finance", 80, ["Only 3 skills listed"]), timestamp=0))
+    rollup.add(make_record(_result(4.0, "finance", 60, ["Only 4 skills listed"]), timestamp=0))
+    rollup.add(make_record(_result(9.9, None, 90, []), timestamp=86400))
+
+    stats = rollup.stats()
+    assert stats["records"] == 3
+    assert stats["fields"]["finance"]["count"] == 2
+    assert stats["fields"]["finance"]["mean_score"] == 5.75
+    assert stats["fields"]["finance"]["score_histogram"][7] == 1
+    assert stats["fields"]["unknown"]["score_histogram"][9] == 1
+    assert stats["top_weaknesses"] == [{"weakness": "Only N skills listed", "count": 2}]
+    assert [day["mean_ats"] for day in stats["ats_trend"]] == [70.0, 90.0]
+
+
+def test_sink_writes_log_and_restores_rollup(tmp_path):
+    """Records are flushed on stop and rollups survive a restart."""
+    sink = AnalyticsSink(str(tmp_path), flush_interval=0.05)
+    sink.start()
+    for _ in range(3):
+        sink.record(_result(6.0, "marketing", 70, ["Resume slightly long"]))
+    sink.stop()
+
+    assert len((tmp_path / "analytics.jsonl").read_text().splitlines()) == 3
+    assert sink.stats()["records"] == 3
+
+    # A line appended after the snapshot is replayed on load
+    (tmp_path / "analytics.jsonl").open("a").write(
+        '{"ts":0,"score":2.0,"field":"marketing","ats":40,"weaknesses":[]}\n'
+    )
+    restored = AnalyticsSink(str(tmp_path))
+    assert restored.stats()["records"] == 4
+    assert restored.stats()["fields"]["marketing"]["count"] == 4
+
+
+def test_sinks_sharing_a_directory_count_every_process(tmp_path):
+    """Two processes' sinks see each other's records and one snapshot covers both."""
+    first = AnalyticsSink(str(tmp_path), flush_interval=0.05)
+    second = AnalyticsSink(str(tmp_path), flush_interval=0.05)
+    first.start()
+    second.start()
+    for _ in range(2):
+        first.record(_result(6.0, "marketing", 70, []))
+    for _ in range(3):
+        second.record(_result(8.0, "software / it", 80, []))
+    second.stop()
+    first.stop()
+
+    # The sink stopped last has folded in the other one's records too
+    assert first.stats()["records"] == 5
+    assert len((tmp_path / "analytics.jsonl").read_text().splitlines()) == 5
+
+    restored = AnalyticsSink(str(tmp_path))
+    assert restored.stats()["records"] == 5
+    assert restored.stats()["fields"]["software / it"]["count"] == 3
@@ -207,3 +207,96 @@ def test_empty_resume():
     assert result['score'] >= 0
     assert len(result['weaknesses']) > 0
 
+
+
+def test_iter_analysis_streams_stages_then_result():
+    """iter_analysis should emit each stage before a result matching analyze()."""
+    resume_text = """
+    SKILLS
+    Python, JavaScript, React, Docker, AWS
+
+    EXPERIENCE
+    Software Engineer (2020-2023)
+    - Improved latency by 40%
+    """
+    events = list(ResumeAnalyzer(resume_text).iter_analysis())
+    names = [event for event, _ in events]
+
+    assert names[:2] == ["sections", "field"]
+    assert names.count("section_score") == 5
+    assert names[-2:] == ["ats_readiness", "result"]
+    assert events[-1][1] == ResumeAnalyzer(resume_text).analyze()
+
+
+def test_quick_analysis_matches_full_score_without_feedback():
+    """Quick mode returns score and field only, agreeing with full mode on a clean resume."""
+    resume_text = """
+    SKILLS
+    Python, JavaScript, React, Node.js, Docker, AWS
+
+    EXPERIENCE
+    Software Engineer at Tech Corp (2020-2023)
+    - Increased system performance by 50%
+    - Managed team of 5 developers
+
+    EDUCATION
+    Bachelor of Science in Computer Science
+    University of Technology (2016-2020)
+
+    PROJECTS
+    1. E-commerce Platform
+    - Built with React and Node.js
+    """
+    quick = ResumeAnalyzer(resume_text).analyze("quick")
+    full = ResumeAnalyzer(resume_text).analyze("full")
+
+    assert quick["depth"] == "quick"
+    assert quick["score"] == full["score"]
+    assert quick["sections"] == full["sections"]
+    assert quick["field"] == full["field"]
+    assert quick["strengths"] == [] and quick["weaknesses"] == []
+    assert quick["ats_readiness"] is None
+
+    quick_events = list(ResumeAnalyzer(resume_text).iter_analysis("quick"))
+    section_events = [payload for event, payload in quick_events if event == "section_score"]
+    assert all(set(payload) == {"section", "score"} for payload in section_events)
+    assert "ats_readiness" not in [event for event, _ in quick_events]
+
+
+def test_unknown_depth_rejected():
+    """Only quick and full are valid depths."""
+    with pytest.raises(ValueError):
+        ResumeAnalyzer("text").analyze("deep")
+
+
+def test_header_search_matches_multiline_regex():
+    """_find_header returns the same offset as the original [#\\s]* header regex."""
+    import re
+    from app.analyzer import _find_header
+
+    texts = [
+        "skills\npython",
+        "intro\n\n\n  skills:\npython",
+        "intro\n#\n # \n## skills\npython",
+        "intro\n#x\n\nskills  \npython",
+        "no header here, just skills in a sentence",
+        "\n\n\nskills",
+    ]
+    for text in texts:
+        match = re.search(r'^[#\s]*skills[:\s]*$', text, re.IGNORECASE | re.MULTILINE)
+        assert _find_header(text, "skills") == (match.start() if match else -1)
+
+
+def test_pathological_text_is_analyzed_quickly():
+    """Long digit/word runs and blank-line blocks no longer cost quadratic time."""
+    import time
+
+    resume = "Experience\n2019-2021 Engineer\nSkills\npython, sql\nEducation\nUniversity\n"
+    for text in (
+        resume.replace("Engineer", "1" * 50000),
+        resume + "a" * 50000,
+        resume.replace("Skills", "\n" * 50000 + "Skills"),
+    ):
+        start = time.perf_counter()
+        ResumeAnalyzer(text).analyze()
+        assert time.perf_counter() - start < 2.0
@@ -0,0 +1,109 @@
+"""
+Endpoint tests for the analyze, stream and lookup APIs.
+"""
+import hashlib
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+RESUME = (
+    b"Jane Doe\njane@example.com | +1 555-123-4567\n\n"
+    b"Skills\nPython, SQL, Docker, React, AWS\n\n"
+    b"Experience\nSoftware Engineer, Acme (2019-2023)\n- Improved latency by 40% for 5000 users\n\n"
+    b"Education\nBachelor of Science, State University 2018\n"
+)
+
+
+def _upload(content=RESUME):
+    return {"file": ("resume.txt", content, "text/plain")}
+
+
+def _events(response):
+    """(event, payload) for every Server-Sent Event in a response body."""
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "ANALYTICS_DIR", str(tmp_path / "analytics"))
+    monkeypatch.setattr(main, "RESULT_STORE_PATH", str(tmp_path / "results.sqlite3"))
+    monkeypatch.setattr(main, "AUTOTUNE_MAX_WORKERS", 1)
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_stream_events_in_order_then_stored_result(client):
+    """The stream sends pages and stages before the result; a repeat upload gets the stored result only."""
+    response = client.post("/analyze/stream", files=_upload())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(response)
+    assert [event for event, _ in events] == (
+        ["page", "sections", "field"] + ["section_score"] * 5 + ["ats_readiness", "result"]
+    )
+    result = events[-1][1]
+    assert result == client.post("/analyze", files=_upload()).json()
+
+    assert _events(client.post("/analyze/stream", files=_upload())) == [("result", result)]
+
+
+def test_stream_reports_errors_as_event(client):
+    """Failures after the stream started arrive as a final error event."""
+    events = _events(client.post("/analyze/stream", files=_upload(b"too short")))
+    assert [event for event, _ in events] == ["page", "error"]
+    assert events[-1][1]["status"] == 400
+
+
+def test_lookup_by_hash(client):
+    """Unknown hashes are 404, analyzed files are 200, malformed digests are 400."""
+    digest = hashlib.sha256(RESUME).hexdigest()
+    assert client.get(f"/analyze/{digest}").status_code == 404
+
+    analyzed = client.post("/analyze", files=_upload()).json()
+    response = client.get(f"/analyze/{digest.upper()}")
+    assert response.status_code == 200
+    assert response.json() == analyzed
+    assert client.get(f"/analyze/{digest}?depth=quick").status_code == 404
+    assert client.get("/analyze/not-a-digest").status_code == 400
+
+
+def test_lookup_with_store_disabled(tmp_path, monkeypatch):
+    """An empty RESULT_STORE_PATH turns the store off: every lookup is a miss."""
+    monkeypatch.setattr(main, "ANALYTICS_DIR", str(tmp_path / "analytics"))
+    monkeypatch.setattr(main, "RESULT_STORE_PATH", "")
+    monkeypatch.setattr(main, "AUTOTUNE_MAX_WORKERS", 1)
+    with TestClient(main.app) as client:
+        assert client.post("/analyze", files=_upload()).status_code == 200
+        assert client.get(f"/analyze/{hashlib.sha256(RESUME).hexdigest()}").status_code == 404
+    assert not (tmp_path / "results.sqlite3").exists()
+
+
+def test_timeout_is_504(client, monkeypatch):
+    """An analysis that outlives its deadline is a 504, or an error event when streaming."""
+    monkeypatch.setattr(main, "ANALYSIS_TIMEOUT_SECONDS", 0)
+    assert client.post("/analyze", files=_upload()).status_code == 504
+
+    events = _events(client.post("/analyze/stream", files=_upload()))
+    assert events[-1][0] == "error"
+    assert events[-1][1]["status"] == 504
+
+
+def test_saturated_pool_is_503(client):
+    """Past the admission limit both endpoints answer 503 before doing any work."""
+    pool = client.app.state.analysis_pool
+    pool.set_admission_limit(1)
+    slot = pool._acquire_slot()
+    try:
+        assert client.post("/analyze", files=_upload()).status_code == 503
+        assert client.post("/analyze/stream", files=_upload()).status_code == 503
+    finally:
+        pool._release_slot(slot)
+    assert client.post("/analyze", files=_upload()).status_code == 200
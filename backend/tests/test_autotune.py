@@ -0,0 +1,81 @@
+"""
+Tests for cgroup-aware limit detection and the pool autotuner.
+"""
+from app.autotune import Autotuner, ResourceLimits, detect_limits
+
+GB = 2**30
+
+
+def test_detect_limits_cgroup_v2(tmp_path):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    (tmp_path / "memory.max").write_text(str(GB))
+    limits = detect_limits(str(tmp_path))
+    assert limits.cpus <= 1.5
+    assert limits.memory_bytes == GB
+    assert limits.memory_source == "cgroup v2 memory.max"
+
+
+def test_detect_limits_cgroup_v1_unlimited(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000")
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "memory" / "memory.limit_in_bytes").write_text(str(2**63 - 4096))
+    limits = detect_limits(str(tmp_path))
+    assert limits.cpu_source in ("cpu affinity", "cpu count")
+    assert limits.memory_source == "physical memory"
+
+
+def test_initial_decision_is_bounded_by_cpus_and_memory():
+    tuner = Autotuner(ResourceLimits(8, 1 * GB, "test", "test"), assumed_worker_rss_mb=200)
+    # 80% of 1 GB fits four 200 MB workers, fewer than the 8 cores
+    assert tuner.current.workers == 4
+    # 4 workers at the assumed 1 s per request queue 40 jobs within 10 s
+    assert tuner.current.admission_limit == 44
+    assert any("at most 4 workers" in reason for reason in tuner.current.reasons)
+
+
+def test_admission_follows_measured_cost():
+    tuner = Autotuner(
+        ResourceLimits(2, 16 * GB, "test", "test"), min_samples=5, interval=0, target_queue_seconds=10
+    )
+    for _ in range(5):
+        tuner.observe(extract_seconds=0.4, analyze_seconds=0.1, rss_bytes=100 * 2**20)
+    decision = tuner.maybe_decide()
+    # 2 workers at 0.5 s per request clear 4 req/s: 2 running + 40 queued
+    assert (decision.workers, decision.admission_limit) == (2, 42)
+    assert tuner.snapshot()["history"][0]["admission_limit"] == 22
+
+
+def test_single_cpu_starts_from_assumed_cost_not_worker_count():
+    tuner = Autotuner(ResourceLimits(1, None, "test", "test"), target_queue_seconds=30, assumed_request_seconds=0.5)
+    assert (tuner.current.workers, tuner.current.admission_limit) == (1, 61)
+    assert any("assumed cost 500 ms" in reason for reason in tuner.current.reasons)
+
+
+def test_decisions_are_rate_limited_and_only_reported_on_change():
+    tuner = Autotuner(ResourceLimits(2, None, "test", "test"), min_samples=1, interval=3600)
+    tuner.observe(0.1, 0.1, 0)
+    assert tuner.maybe_decide() is None
+
+    tuner.interval = 0
+    tuner.observe(0.1, 0.1, 0)
+    assert tuner.maybe_decide() is not None
+    assert tuner.maybe_decide() is None
+
+
+def test_bounds_pin_worker_count():
+    tuner = Autotuner(ResourceLimits(16, None, "test", "test"), min_workers=3, max_workers=3, max_admission=5)
+    assert (tuner.current.workers, tuner.current.admission_limit) == (3, 5)
+
+
+def test_server_processes_split_the_limits():
+    """Four uvicorn processes on 4 CPUs and 1 GB each size for one CPU and 256 MB."""
+    limits = ResourceLimits(4, 1 * GB, "cgroup v2 cpu.max", "cgroup v2 memory.max").shared_by(4)
+    assert (limits.cpus, limits.memory_bytes) == (1, GB // 4)
+    assert limits.cpu_source == "cgroup v2 cpu.max, split across 4 server processes"
+
+    tuner = Autotuner(limits, assumed_worker_rss_mb=100)
+    # 80% of 256 MB fits two 100 MB workers, but the share has one CPU
+    assert tuner.current.workers == 1
+    assert ResourceLimits(4, None, "test", "test").shared_by(1).cpus == 4
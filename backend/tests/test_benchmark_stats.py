@@ -0,0 +1,44 @@
+"""
+Tests for the benchmark statistics helpers.
+"""
+from benchmarks.stats import find_knee, latency_summary, percentile
+
+
+def _run(rate, throughput, p99, error_rate=0.0):
+    return {
+        "offered_rate": rate,
+        "throughput": throughput,
+        "error_rate": error_rate,
+        "latency": {"p99": p99},
+    }
+
+
+def test_percentile_nearest_rank():
+    """Nearest-rank percentiles on a small sample."""
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 99) == 5
+    assert percentile([], 50) is None
+
+
+def test_latency_summary_empty():
+    """An empty sample has no percentiles."""
+    assert latency_summary([]) == {"p50": None, "p95": None, "p99": None, "max": None}
+
+
+def test_find_knee_stops_at_first_saturated_rate():
+    """The knee is the last healthy rate before latency or goodput breaks."""
+    runs = [
+        _run(8, 5.0, 3.5),
+        _run(1, 1.0, 0.4),
+        _run(2, 2.0, 0.5),
+        _run(4, 3.9, 1.2),
+        _run(16, 16.0, 0.5),
+    ]
+    knee = find_knee(runs, p99_slo=2.0)
+    assert knee["offered_rate"] == 4
+
+
+def test_find_knee_none_when_first_rate_fails():
+    """No knee when even the lowest rate misses the error budget."""
+    assert find_knee([_run(1, 1.0, 0.3, error_rate=0.5)], p99_slo=2.0) is None
@@ -0,0 +1,77 @@
+"""
+Tests for the memory-mapped corpus format.
+"""
+import hashlib
+
+import pytest
+
+from app.corpus import CorpusReader, CorpusWriter
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _write(path, texts):
+    with CorpusWriter(str(path)) as writer:
+        for i, text in enumerate(texts):
+            writer.add(_digest(text), text, page_count=i + 1, extractor="pdfplumber" if i % 2 else "text")
+
+
+def test_round_trip_with_metadata(tmp_path):
+    texts = ["Jane Doe\nSkills\npython", "Ünïcödé résumé " * 100, ""]
+    path = tmp_path / "corpus.bin"
+    _write(path, texts)
+
+    with CorpusReader(str(path)) as reader:
+        assert len(reader) == len(texts)
+        by_hash = {record.sha256: (i, record) for i, record in enumerate(reader)}
+        for page_count, text in enumerate(texts, start=1):
+            i, record = by_hash[_digest(text)]
+            assert reader.text(i) == text
+            assert record.page_count == page_count
+            assert record.text_length == len(text.encode())
+            assert record.extractor == ("pdfplumber" if page_count % 2 == 0 else "text")
+
+
+def test_records_are_compressed_and_payloads_are_views(tmp_path):
+    path = tmp_path / "corpus.bin"
+    _write(path, ["experience " * 10000])
+
+    with CorpusReader(str(path)) as reader:
+        record = reader.record(0)
+        assert record.compressed_length < record.text_length / 10
+        with reader.payload(0) as payload:
+            assert isinstance(payload, memoryview)
+            assert len(payload) == record.compressed_length
+
+
+def test_find_by_hash_and_duplicates(tmp_path):
+    path = tmp_path / "corpus.bin"
+    texts = [f"resume {i}" for i in range(50)]
+    with CorpusWriter(str(path)) as writer:
+        for text in texts:
+            assert writer.add(_digest(text), text, 1, "docx")
+        assert not writer.add(_digest(texts[0]), texts[0], 1, "docx")
+
+    with CorpusReader(str(path)) as reader:
+        assert len(reader) == 50
+        for text in texts:
+            assert reader.text(reader.find(_digest(text))) == text
+        assert reader.find(_digest("missing")) is None
+
+
+def test_failed_export_leaves_no_file(tmp_path):
+    path = tmp_path / "corpus.bin"
+    with pytest.raises(RuntimeError):
+        with CorpusWriter(str(path)) as writer:
+            writer.add(_digest("a"), "a", 1, "text")
+            raise RuntimeError("extraction crashed")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-corpus.bin"
+    path.write_bytes(b"%PDF-1.4" + b"\0" * 100)
+    with pytest.raises(ValueError):
+        CorpusReader(str(path))
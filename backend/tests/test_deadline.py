@@ -0,0 +1,42 @@
+"""
+Tests for cooperative request deadlines.
+"""
+import time
+
+import pytest
+from app.analyzer import ResumeAnalyzer
+from app.deadline import Deadline, DeadlineExceeded
+
+
+def test_deadline_without_timeout_never_expires():
+    """A deadline with no timeout only stops when cancelled."""
+    deadline = Deadline()
+    assert deadline.remaining() is None
+    deadline.check()
+
+    deadline.cancel()
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        deadline.check()
+    assert exc_info.value.reason == "cancelled"
+
+
+def test_deadline_expires():
+    """check() raises with reason 'timeout' once the deadline has passed."""
+    deadline = Deadline(expires_at=time.monotonic() - 1)
+    assert deadline.expired()
+    assert deadline.remaining() == 0.0
+
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        deadline.check()
+    assert exc_info.value.reason == "timeout"
+
+
+def test_analyzer_stops_on_cancelled_deadline():
+    """Analyzer stages check the deadline between stages."""
+    deadline = Deadline(timeout=60)
+    stages = ResumeAnalyzer("SKILLS\nPython, SQL", deadline).iter_analysis()
+
+    assert next(stages)[0] == "sections"
+    deadline.cancel()
+    with pytest.raises(DeadlineExceeded):
+        next(stages)
@@ -0,0 +1,72 @@
+"""
+Tests for the DOCX and plain-text extractors.
+"""
+import io
+import tracemalloc
+import zipfile
+
+import pytest
+from app.utils.docx_extractor import extract_text_from_docx_bytes, iter_docx_paragraphs
+from app.utils.text_extractor import extract_text_from_text_bytes
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _make_docx(paragraphs, extra_body=""):
+    body = extra_body + "".join(
+        f"<w:p><w:r><w:t>{left}</w:t><w:tab/><w:t>{right}</w:t></w:r></w:p>" if right
+        else f"<w:p><w:r><w:t>{left}</w:t></w:r></w:p>"
+        for left, right in paragraphs
+    )
+    xml = f'<?xml version="1.0"?><w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", xml)
+    return buffer.getvalue()
+
+
+def test_extract_text_from_docx_bytes():
+    """Paragraphs become lines and tabs are preserved."""
+    docx = _make_docx([("SKILLS", None), ("Python", "SQL"), ("", None)])
+    assert extract_text_from_docx_bytes(docx) == "SKILLS\nPython\tSQL"
+
+
+def test_docx_memory_does_not_grow_with_paragraph_count():
+    """Parsed paragraphs are detached from the body instead of piling up as empty elements."""
+    docx = _make_docx([(f"Line {i}", None) for i in range(50_000)])
+    tracemalloc.start()
+    try:
+        assert sum(1 for _ in iter_docx_paragraphs(docx)) == 50_000
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 2 * 2**20
+
+
+def test_docx_table_paragraphs_are_extracted():
+    """Paragraphs inside a table that was detached mid-parse are still read."""
+    table = (
+        "<w:p><w:r><w:t>SKILLS</w:t></w:r></w:p>"
+        "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Python</w:t></w:r></w:p></w:tc>"
+        "<w:tc><w:p><w:r><w:t>SQL</w:t></w:r></w:p></w:tc></w:tr></w:tbl>"
+    )
+    docx = _make_docx([("EXPERIENCE", None)], extra_body=table)
+    assert extract_text_from_docx_bytes(docx) == "SKILLS\nPython\nSQL\nEXPERIENCE"
+
+
+def test_extract_text_from_docx_bytes_invalid():
+    """A zip without word/document.xml is rejected."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("other.txt", "hello")
+
+    with pytest.raises(ValueError):
+        extract_text_from_docx_bytes(buffer.getvalue())
+    with pytest.raises(ValueError):
+        extract_text_from_docx_bytes(b"not a zip")
+
+
+def test_extract_text_from_text_bytes():
+    """UTF-8 with BOM is decoded, other bytes fall back to Latin-1."""
+    assert extract_text_from_text_bytes("﻿Café".encode("utf-8")) == "Café"
+    assert extract_text_from_text_bytes("Café".encode("latin-1")) == "Café"
@@ -0,0 +1,40 @@
+"""
+Tests for upload format sniffing.
+"""
+from app.utils.formats import DOCX, PDF, TEXT, extract_text, sniff_format
+
+
+def test_sniff_format_uses_magic_bytes():
+    """Magic bytes win over the declared content type."""
+    assert sniff_format(b"%PDF-1.7\n...", "application/octet-stream") == PDF
+    assert sniff_format(b"PK\x03\x04rest-of-zip", "application/octet-stream") == DOCX
+
+
+def test_sniff_format_pdf_header_after_junk():
+    """A PDF header after binary junk or in a declared PDF is a PDF; inside text it is not."""
+    assert sniff_format(b"\x00\x00MacBinary\x00%PDF-1.4\n...", "application/octet-stream") == PDF
+    assert sniff_format(b"\r\n%PDF-1.4\n...", "application/pdf") == PDF
+    notes = b"SKILLS\nPython\n\nNotes: exports start with the %PDF-1.7 header\n"
+    assert sniff_format(notes, "text/plain") == TEXT
+    assert sniff_format(notes, None) == TEXT
+    assert sniff_format(b"PK\x03\x04word/%PDF-1.7", "application/octet-stream") == DOCX
+
+
+def test_sniff_format_text():
+    """Plain text is accepted only when it looks like text."""
+    assert sniff_format(b"SKILLS\nPython", "text/plain") == TEXT
+    assert sniff_format(b"SKILLS\nPython", None) == TEXT
+    assert sniff_format(b"\x00\x01\x02", "text/plain") is None
+    assert sniff_format(b"GIF89a", "image/gif") is None
+
+
+def test_sniff_format_accepts_latin1_text():
+    """Text that is not UTF-8 is still text; the extractor falls back to Latin-1."""
+    content = "Compétences\nPython, SQL\nExpérience\nDéveloppeur".encode("latin-1")
+    assert sniff_format(content, "text/plain") == TEXT
+    assert "Compétences" in extract_text(content, TEXT)
+
+
+def test_sniff_format_declared_pdf_without_header():
+    """A declared PDF without a header still goes to the PDF extractor."""
+    assert sniff_format(b"This is not a PDF file", "application/pdf") == PDF
@@ -1,8 +1,11 @@
 """
 Tests for PDF extractor utility.
 """
+import pdfplumber
 import pytest
-from app.utils.pdf_extractor import extract_text_from_pdf_bytes
+from app.utils.formats import PDF, extract_document
+from app.utils.pdf_extractor import extract_text_from_pdf_bytes, iter_pdf_pages
+from benchmarks.analysis_depth import text_to_pdf
 import io
 
 
@@ -21,3 +24,29 @@ def test_extract_text_from_pdf_bytes_empty():
     with pytest.raises(ValueError):
         extract_text_from_pdf_bytes(empty_bytes)
 
+
+def _failing_on_page(page_number):
+    original = pdfplumber.page.Page.extract_text
+
+    def extract_text(page, *args, **kwargs):
+        if page.page_number == page_number:
+            raise RuntimeError("broken content stream")
+        return original(page, *args, **kwargs)
+
+    return extract_text
+
+
+def test_pdfplumber_failure_mid_document_falls_back(monkeypatch):
+    """If pdfplumber fails after returning pages, PyPDF2 starts over and its pages replace them."""
+    pdf = text_to_pdf("\n".join(f"Line {i} of the resume" for i in range(60)), lines_per_page=30)
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_text", _failing_on_page(2))
+
+    text = extract_text_from_pdf_bytes(pdf)
+    assert text.count("Line 0 of the resume") == 1
+    assert "Line 59 of the resume" in text
+
+    extractors = []
+    pages = list(iter_pdf_pages(pdf, on_extractor=extractors.append))
+    assert extractors == ["pdfplumber", "pypdf2"]
+    assert [number for number, _ in pages] == [1, 1, 2]
+    assert extract_document(pdf, PDF)[1:] == (2, "pypdf2")
@@ -0,0 +1,244 @@
+"""
+Tests for the analysis process pool.
+"""
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+from app.deadline import Deadline, DeadlineExceeded
+from app.metrics import metrics
+from app.pool import AnalysisPool
+from app.supervisor import WorkerSupervisor
+from app.tracing import tracer
+from app.utils.formats import TEXT
+
+RESUME = (
+    b"Jane Doe\njane@example.com\n\nSkills\nPython, SQL, Docker, React, AWS\n\n"
+    b"Experience\nSoftware Engineer, Acme 2019-2021\n- Improved latency by 40%\n"
+)
+
+
+def test_slot_released_when_submit_fails():
+    """A job that never reaches the executor does not keep its admission slot."""
+    pool = AnalysisPool(max_workers=1, max_pending=2)
+    pool.shutdown()
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            asyncio.run(pool.analyze(b"%PDF-1.4", Deadline(timeout=5)))
+    assert pool.in_flight == 0
+
+
+def test_pool_replaces_executor_after_worker_dies():
+    """Killing a worker starts a new generation instead of failing every later request."""
+    metrics.reset()
+    pool = AnalysisPool(max_workers=1, max_pending=4)
+    try:
+        asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT))
+        [worker] = pool.supervisor.snapshot()["workers"]
+
+        os.kill(worker["pid"], signal.SIGKILL)
+        time.sleep(0.5)
+
+        result = asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT))
+        assert result["score"] > 0
+        snapshot = pool.supervisor.snapshot()
+        assert snapshot["worker_deaths"] == 1
+        assert snapshot["generation"] == 1
+        assert [w["pid"] for w in snapshot["workers"]] != [worker["pid"]]
+        assert metrics.snapshot()["counters"]["workers.died"] == 1
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
+
+
+def test_resize_starts_new_generation():
+    """Workers of the old size drop out of the supervisor's view after a resize."""
+    pool = AnalysisPool(max_workers=1, max_pending=4)
+    try:
+        asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT))
+        assert len(pool.supervisor.snapshot()["workers"]) == 1
+
+        pool.resize(2)
+        snapshot = pool.supervisor.snapshot()
+        assert snapshot["generation"] == 1
+        assert snapshot["workers"] == []
+        assert snapshot["last_recycle_reason"] == "resizing from 1 to 2 workers"
+
+        asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT))
+        assert [w["generation"] for w in pool.supervisor.snapshot()["workers"]] == [1]
+
+        pool.resize(2)
+        assert pool.supervisor.snapshot()["generation"] == 1
+    finally:
+        pool.shutdown()
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def submit(self, spans):
+        self.spans.extend(spans)
+
+
+def test_failed_job_exports_worker_spans():
+    """Spans finished in the worker are exported even when the job raises."""
+    exporter = ListExporter()
+    tracer.configure(1.0, exporter)
+    pool = AnalysisPool(max_workers=1, max_pending=4)
+    try:
+        with tracer.start_trace("d" * 32, name="POST /analyze"):
+            with pytest.raises(ValueError):
+                asyncio.run(pool.analyze(b"too short", Deadline(timeout=30), file_format=TEXT))
+    finally:
+        pool.shutdown()
+        tracer.configure(0.0, None)
+
+    spans = {span["name"]: span for span in exporter.spans}
+    assert spans["worker.analysis"]["trace_id"] == "d" * 32
+    assert spans["worker.analysis"]["parent_id"] == spans["POST /analyze"]["span_id"]
+
+
+def test_stream_relays_worker_events_before_result():
+    """A streamed job yields each page and stage from the worker, then the result, and is measured."""
+    metrics.reset()
+    pool = AnalysisPool(max_workers=1, max_pending=4)
+
+    async def collect():
+        return [event async for event, _ in pool.stream(RESUME, Deadline(timeout=30), file_format=TEXT)]
+
+    try:
+        events = asyncio.run(collect())
+    finally:
+        pool.shutdown()
+
+    assert events == ["page", "sections", "field"] + ["section_score"] * 5 + ["ats_readiness", "result"]
+    assert "extract.text" in metrics.snapshot()["timings"]
+    assert pool.supervisor.snapshot()["workers"][0]["requests"] == 1
+    assert pool.in_flight == 0
+
+
+def test_stream_relays_worker_events_before_error():
+    """Events sent before a job failed are yielded before its error is raised."""
+    pool = AnalysisPool(max_workers=1, max_pending=4)
+    events = []
+
+    async def collect():
+        async for event, _ in pool.stream(b"too short", Deadline(timeout=30), file_format=TEXT):
+            events.append(event)
+
+    try:
+        for _ in range(5):
+            events.clear()
+            with pytest.raises(ValueError):
+                asyncio.run(collect())
+            assert events == ["page"]
+    finally:
+        pool.shutdown()
+
+
+def _occupy_worker(pool, seconds):
+    """Keep the pool's only worker busy so the next job waits in the queue."""
+    return pool._executor.submit(time.sleep, seconds)
+
+
+def _wait_until_idle(pool, timeout=10):
+    stop = time.monotonic() + timeout
+    while pool.in_flight and time.monotonic() < stop:
+        time.sleep(0.05)
+    return pool.in_flight == 0
+
+
+def test_disconnected_client_cancels_job():
+    """A client that goes away gets DeadlineExceeded and the job hands its slot back."""
+    metrics.reset()
+    pool = AnalysisPool(max_workers=1, max_pending=4)
+
+    async def gone():
+        return True
+
+    try:
+        _occupy_worker(pool, 1)
+        with pytest.raises(DeadlineExceeded) as excinfo:
+            asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), gone, file_format=TEXT))
+        assert excinfo.value.reason == "disconnected"
+        assert metrics.snapshot()["counters"]["analysis.cancelled.disconnected"] == 1
+        assert _wait_until_idle(pool)
+    finally:
+        pool.shutdown()
+
+
+def test_abandoned_stream_cancels_job():
+    """Cancelling the task that reads a stream cancels the job behind it."""
+    metrics.reset()
+    pool = AnalysisPool(max_workers=1, max_pending=4)
+
+    async def abandon():
+        events = pool.stream(RESUME, Deadline(timeout=30), file_format=TEXT)
+        reader = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.3)
+        reader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await reader
+        await events.aclose()
+
+    try:
+        _occupy_worker(pool, 1)
+        asyncio.run(abandon())
+        assert metrics.snapshot()["counters"]["analysis.cancelled.disconnected"] == 1
+        assert pool._listeners == {}
+        assert _wait_until_idle(pool)
+    finally:
+        pool.shutdown()
+
+
+def test_worker_replaced_alone_after_request_limit():
+    """A worker that reaches max_requests exits and only it is replaced; the executor stays."""
+    pool = AnalysisPool(max_workers=2, max_pending=4, supervisor=WorkerSupervisor(max_requests=2))
+
+    async def analyze_pair():
+        return await asyncio.gather(
+            *(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT) for _ in range(2))
+        )
+
+    try:
+        executor = pool._executor
+        asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT))
+        asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT))
+        snapshot = pool.supervisor.snapshot()
+        assert snapshot["recycles"] >= 1
+        assert snapshot["last_recycle_reason"].endswith("served 2 requests")
+
+        for _ in range(3):
+            asyncio.run(analyze_pair())
+        snapshot = pool.supervisor.snapshot()
+        assert pool._executor is executor
+        assert snapshot["generation"] == 0
+        assert snapshot["worker_deaths"] == 0
+        assert all(w["requests"] < 2 for w in snapshot["workers"])
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
+
+
+def test_worker_over_rss_limit_retires_after_its_job():
+    """A worker over the RSS limit returns its result, then exits; the next job runs on a new process."""
+    pool = AnalysisPool(max_workers=1, max_pending=4, supervisor=WorkerSupervisor(max_rss_mb=1))
+    try:
+        executor = pool._executor
+        first = asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT))
+        first_reason = pool.supervisor.snapshot()["last_recycle_reason"]
+        assert " RSS " in first_reason
+
+        second = asyncio.run(pool.analyze(RESUME, Deadline(timeout=30), file_format=TEXT))
+        assert second["score"] == first["score"]
+        snapshot = pool.supervisor.snapshot()
+        assert snapshot["recycles"] == 2
+        assert snapshot["last_recycle_reason"].split()[1] != first_reason.split()[1]
+        assert snapshot["generation"] == 0
+        assert pool._executor is executor
+    finally:
+        pool.shutdown()
@@ -0,0 +1,115 @@
+"""
+Tests for field-aware scoring profiles.
+"""
+import json
+
+import pytest
+
+from app import analyzer as analyzer_module
+from app.analyzer import ResumeAnalyzer
+from app.profiles import KeywordMatcher, ProfileRegistry, ScoringProfile, profile_slug, profiles
+
+
+def _write_profile(directory, slug, **data):
+    data.setdefault("skills", ["excel"])
+    (directory / f"{slug}.json").write_text(json.dumps(data))
+
+
+def test_profile_slug():
+    assert profile_slug("software / it") == "software-it"
+    assert profile_slug("Mechanical Engineering") == "mechanical-engineering"
+
+
+def test_matcher_finds_overlapping_keywords():
+    """Same answer as `kw in text` for every keyword, including keywords inside longer ones."""
+    keywords = ["java", "javascript", "git", "github", "script", "ci/cd", "c++"]
+    matcher = KeywordMatcher(keywords)
+    for text in ["javascript and github", "java, git", "ci/cd with c++", "scripting", ""]:
+        assert matcher.find(text) == {kw for kw in keywords if kw in text}
+
+
+def test_matcher_with_no_keywords():
+    assert KeywordMatcher([]).find("anything") == set()
+
+
+def test_profile_thresholds_default_and_reject_unknown():
+    profile = ScoringProfile("finance", ["excel"], [], {"strong_keyword_hits": 4})
+    assert profile["strong_keyword_hits"] == 4
+    assert profile["min_skill_count"] == ScoringProfile.THRESHOLDS["min_skill_count"]
+    with pytest.raises(ValueError):
+        ScoringProfile("finance", ["excel"], [], {"typo": 1})
+
+
+def test_registry_loads_lazily_and_evicts_least_recently_used(tmp_path):
+    _write_profile(tmp_path, "default")
+    for slug in ("finance", "marketing", "cybersecurity"):
+        _write_profile(tmp_path, slug, field=slug, skills=[slug])
+    registry = ProfileRegistry(str(tmp_path), cache_size=2)
+    assert registry.cache_info()["size"] == 0
+
+    assert registry.get("finance").name == "finance"
+    registry.get("marketing")
+    registry.get("finance")
+    registry.get("cybersecurity")
+
+    info = registry.cache_info()
+    assert info["cached"] == ["finance", "cybersecurity"]
+    assert (info["hits"], info["misses"]) == (1, 3)
+
+
+def test_registry_falls_back_to_default(tmp_path):
+    _write_profile(tmp_path, "default", skills=["python"])
+    (tmp_path / "broken.json").write_text("{not json")
+    registry = ProfileRegistry(str(tmp_path))
+
+    assert registry.get(None).name == "default"
+    assert registry.get("astronomy").name == "default"
+    assert registry.get("broken").name == "default"
+
+
+def test_shipped_profiles_cover_every_detected_field():
+    fields = profiles.field_keywords()
+    assert len(fields) == 8
+    for field in fields:
+        assert profiles.get(field).name == field
+
+
+def test_new_profile_file_adds_a_detectable_field(tmp_path, monkeypatch):
+    """Dropping in a JSON file is enough for its field to be detected and scored."""
+    _write_profile(tmp_path, "default", skills=["python"])
+    (tmp_path / "astronomy.json").write_text(json.dumps({
+        "field": "astronomy",
+        "detection_keywords": ["astrophysics", "telescope", "observatory"],
+        "skills": ["spectroscopy", "photometry", "python"],
+    }))
+    (tmp_path / "notes.txt").write_text("not a profile")
+    registry = ProfileRegistry(str(tmp_path))
+    monkeypatch.setattr(analyzer_module, "profiles", registry)
+
+    analyzer = ResumeAnalyzer(
+        "EDUCATION\nPhD in Astrophysics\n\nEXPERIENCE\nTelescope operator, Mauna Kea Observatory\n"
+    )
+    analyzer.detect_sections()
+    assert analyzer.detect_field() == "astronomy"
+    assert analyzer.profile.name == "astronomy"
+    assert list(registry.field_keywords()) == ["astronomy"]
+
+
+def test_finance_resume_scored_on_finance_skills():
+    """A finance resume gets credit for finance skills rather than being judged on Docker and React."""
+    resume_text = """
+    EDUCATION
+    Bachelor of Commerce in Finance and Accounting, State University 2019
+
+    SKILLS
+    Financial modeling, DCF valuation, Excel, Bloomberg, GAAP, Budgeting, Forecasting
+
+    EXPERIENCE
+    Financial Analyst, Investment Banking Co (2019-2023)
+    - Built valuation models for 12 deals
+    """
+    analyzer = ResumeAnalyzer(resume_text)
+    analyzer.detect_sections()
+    assert analyzer.detect_field() == "finance"
+    _, strengths, _ = analyzer.analyze_skills()
+    assert "Strong technical skills with relevant technologies" in strengths
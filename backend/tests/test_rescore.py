@@ -0,0 +1,128 @@
+"""
+Tests for corpus export and bulk re-scoring.
+"""
+import hashlib
+import multiprocessing
+import os
+
+import pytest
+
+from app import rescore as rescore_module
+from app.analyzer import ResumeAnalyzer
+from app.corpus import CorpusReader, CorpusWriter
+from app.rescore import export, main, rescore
+
+RESUME = """
+Jane Doe
+jane@example.com | +1 555-123-4567
+
+SKILLS
+Python, SQL, Docker, React, AWS
+
+EXPERIENCE
+Software Engineer, Acme (2019-2023)
+- Improved latency by 40% for 5000 users
+
+EDUCATION
+Bachelor of Science, State University 2018
+"""
+
+
+def test_export_then_rescore_matches_direct_analysis(tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    (archive / "jane.txt").write_text(RESUME)
+    (archive / "copy.txt").write_text(RESUME)
+    (archive / "empty.txt").write_text("too short")
+    (archive / "notes.md").write_text(RESUME)
+
+    corpus = str(tmp_path / "corpus.bin")
+    summary = export(str(archive), corpus, workers=1)
+    assert (summary["files"], summary["records"], summary["duplicates"]) == (3, 2, 1)
+
+    with CorpusReader(corpus) as reader:
+        record = reader.record(reader.find(hashlib.sha256(RESUME.encode()).hexdigest()))
+        assert (record.page_count, record.extractor) == (1, "text")
+
+    results = {r["sha256"]: r for r in rescore(corpus, workers=1, chunk_size=1)}
+    assert results[hashlib.sha256(RESUME.encode()).hexdigest()]["result"] == ResumeAnalyzer(RESUME).analyze()
+    assert results[hashlib.sha256(b"too short").hexdigest()]["error"]
+
+
+def test_rescore_keeps_corpus_order_with_bounded_window(tmp_path):
+    """More ranges than the submission window still come back complete and in order."""
+    corpus = str(tmp_path / "corpus.bin")
+    with CorpusWriter(corpus) as writer:
+        for i in range(10):
+            text = RESUME + f"\nReference {i}\n"
+            writer.add(hashlib.sha256(text.encode()).hexdigest(), text, 1, "text")
+    with CorpusReader(corpus) as reader:
+        expected = [record.sha256 for record in reader]
+
+    assert [r["sha256"] for r in rescore(corpus, workers=1, chunk_size=1)] == expected
+
+
+def test_quick_results_are_not_written_to_result_store(tmp_path):
+    """Quick scores of full corpus text would differ from the server's page-1 quick scores."""
+    with pytest.raises(SystemExit):
+        main([
+            "run", "--corpus", str(tmp_path / "corpus.bin"), "--depth", "quick",
+            "--result-store", str(tmp_path / "results.sqlite3"),
+        ])
+    assert not (tmp_path / "results.sqlite3").exists()
+
+
+def _write_corpus(path, count):
+    texts = [RESUME + f"\nReference {i}\n" for i in range(count)]
+    with CorpusWriter(path) as writer:
+        for text in texts:
+            writer.add(hashlib.sha256(text.encode()).hexdigest(), text, 1, "text")
+    with CorpusReader(path) as reader:
+        return [record.sha256 for record in reader]
+
+
+def test_analyzer_failure_is_reported_per_record(tmp_path, monkeypatch):
+    """A record the analyzer raises on becomes an error; the rest of its range is still scored."""
+    corpus = str(tmp_path / "corpus.bin")
+    _write_corpus(corpus, 3)
+    analyze = ResumeAnalyzer.analyze
+
+    def fail_on_reference_1(self, depth=ResumeAnalyzer.FULL):
+        if "reference 1" in self.text:
+            raise RuntimeError("boom")
+        return analyze(self, depth)
+
+    monkeypatch.setattr(ResumeAnalyzer, "analyze", fail_on_reference_1)
+    rescore_module._open_corpus(corpus)
+    scored = rescore_module._score_range(0, 3, ResumeAnalyzer.FULL)
+
+    failing = hashlib.sha256((RESUME + "\nReference 1\n").encode()).hexdigest()
+    assert {r["sha256"]: r.get("error") for r in scored if "result" not in r} == {
+        failing: "Analysis failed: RuntimeError('boom')"
+    }
+    assert len(scored) == 3
+
+
+def _crash_on_record_3(start, stop, depth):
+    if start <= 3 < stop:
+        os._exit(1)
+    return _score_range(start, stop, depth)
+
+
+_score_range = rescore_module._score_range
+
+
+def test_worker_crash_fails_only_its_range(tmp_path, monkeypatch):
+    """A range that kills its worker is reported as errors; the run goes on with fresh workers."""
+    corpus = str(tmp_path / "corpus.bin")
+    expected = _write_corpus(corpus, 6)
+    # Forked workers see the patched range scorer
+    fork = multiprocessing.get_context("fork")
+    monkeypatch.setattr(rescore_module.multiprocessing, "get_context", lambda method=None: fork)
+    monkeypatch.setattr(rescore_module, "_score_range", _crash_on_record_3)
+
+    records = list(rescore(corpus, workers=2, chunk_size=1))
+
+    assert [r["sha256"] for r in records] == expected
+    assert [i for i, r in enumerate(records) if "error" in r] == [3]
+    assert records[3]["error"] == "Worker process died"
@@ -0,0 +1,57 @@
+"""
+Tests for the hash-keyed result store.
+"""
+import hashlib
+
+from app.result_store import ResultStore, is_sha256
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_is_sha256():
+    assert is_sha256(_digest(b"resume"))
+    assert not is_sha256("abc123")
+    assert not is_sha256(_digest(b"resume").upper())
+
+
+def test_get_put_by_depth(tmp_path):
+    """Results are returned for the depth they were computed at, and survive a reopen."""
+    path = str(tmp_path / "results.sqlite3")
+    store = ResultStore(path, scoring_version=1)
+    digest = _digest(b"resume")
+    assert store.get(digest, "full") is None
+
+    store.put(digest, "full", {"score": 7.5, "field": "finance"})
+    assert store.get(digest, "full") == {"score": 7.5, "field": "finance"}
+    assert store.get(digest, "quick") is None
+    store.close()
+
+    reopened = ResultStore(path, scoring_version=1)
+    assert reopened.get(digest, "full")["score"] == 7.5
+    reopened.close()
+
+
+def test_results_from_older_scoring_version_are_ignored(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    digest = _digest(b"resume")
+    old = ResultStore(path, scoring_version=1)
+    old.put(digest, "full", {"score": 5.0})
+    old.close()
+
+    store = ResultStore(path, scoring_version=2)
+    assert store.get(digest, "full") is None
+    store.close()
+
+
+def test_prune_keeps_newest_entries(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"), scoring_version=1, max_entries=10)
+    digests = [_digest(str(i).encode()) for i in range(ResultStore.PRUNE_EVERY)]
+    for i, digest in enumerate(digests):
+        store.put(digest, "full", {"score": i})
+
+    assert store.get(digests[0], "full") is None
+    assert store.get(digests[-1], "full") == {"score": len(digests) - 1}
+    assert store._db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 10
+    store.close()
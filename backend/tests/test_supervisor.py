@@ -0,0 +1,62 @@
+"""
+Tests for the analysis worker supervisor.
+"""
+from app.supervisor import WorkerSupervisor
+
+MB = 2**20
+
+
+def test_supervisor_replaces_worker_on_request_limit():
+    """Crossing max_requests retires that worker only; failed jobs count too."""
+    supervisor = WorkerSupervisor(max_requests=3)
+    assert not supervisor.observe(0, pid=10, rss_bytes=100 * MB, extract_seconds=0.2)
+    assert not supervisor.observe(0, pid=10, rss_bytes=None, extract_seconds=0.0)
+    assert not supervisor.observe(0, pid=11, rss_bytes=100 * MB, extract_seconds=0.2)
+    assert supervisor.observe(0, pid=10, rss_bytes=100 * MB, extract_seconds=0.2)
+
+    snapshot = supervisor.snapshot()
+    assert snapshot["generation"] == 0
+    assert snapshot["recycles"] == 1
+    assert snapshot["last_recycle_reason"] == "worker 10 served 3 requests"
+    assert [w["pid"] for w in snapshot["workers"]] == [11]
+
+
+def test_supervisor_replaces_worker_on_rss_limit_and_ignores_old_generation():
+    """Each worker over the RSS limit is retired; reports from drained generations are ignored."""
+    supervisor = WorkerSupervisor(max_rss_mb=256)
+    assert supervisor.observe(0, pid=10, rss_bytes=300 * MB, extract_seconds=1.0)
+    assert supervisor.observe(0, pid=11, rss_bytes=900 * MB, extract_seconds=1.0)
+    assert supervisor.snapshot()["recycles"] == 2
+
+    supervisor.start_new_generation("resizing from 2 to 1 workers")
+    assert not supervisor.observe(0, pid=12, rss_bytes=900 * MB, extract_seconds=1.0)
+    assert supervisor.snapshot()["workers"] == []
+
+
+def test_supervisor_flags_steady_rss_growth():
+    """A worker whose RSS grows on every request is reported as a suspected leak."""
+    supervisor = WorkerSupervisor(max_rss_mb=4096, leak_threshold_kb=256, leak_min_requests=5)
+    for request in range(6):
+        supervisor.observe(0, pid=10, rss_bytes=(100 + request) * MB, extract_seconds=0.1)
+    supervisor.observe(0, pid=11, rss_bytes=100 * MB, extract_seconds=0.1)
+
+    workers = {w["pid"]: w for w in supervisor.snapshot()["workers"]}
+    assert workers[10]["suspected_leak"] is True
+    assert workers[10]["rss_growth_per_request_kb"] == 1024.0
+    assert workers[10]["extract_seconds_total"] == 0.6
+    assert workers[11]["suspected_leak"] is False
+
+
+def test_supervisor_counts_worker_death_once_per_generation():
+    """A dead worker starts a new generation; other jobs of the broken executor are ignored."""
+    supervisor = WorkerSupervisor()
+    supervisor.observe(0, pid=10, rss_bytes=100 * MB, extract_seconds=0.1)
+
+    assert supervisor.worker_died(0)
+    assert not supervisor.worker_died(0)
+
+    snapshot = supervisor.snapshot()
+    assert snapshot["generation"] == 1
+    assert snapshot["worker_deaths"] == 1
+    assert snapshot["last_recycle_reason"] == "a worker process died"
+    assert snapshot["workers"] == []
@@ -0,0 +1,36 @@
+"""
+Tests for input shaping ahead of the analyzer.
+"""
+from app.utils.text_shaping import (
+    MAX_BLANK_LINES,
+    MAX_LINE_CHARS,
+    MAX_SPACE_RUN,
+    MAX_TEXT_CHARS,
+    shape_text,
+)
+
+
+def test_ordinary_text_is_unchanged():
+    text = "Jane Doe\n\nSKILLS\nPython,   SQL\n\n- Led a team of 5\n"
+    assert shape_text(text) == text
+
+
+def test_text_is_capped():
+    assert len(shape_text("word " * MAX_TEXT_CHARS)) <= MAX_TEXT_CHARS + MAX_TEXT_CHARS // MAX_LINE_CHARS
+
+
+def test_line_endings_and_whitespace_runs_are_normalized():
+    shaped = shape_text("a\r\nb\rc" + " " * 100 + "d" + "\n" * 50 + "e")
+    assert shaped == "a\nb\nc" + " " * MAX_SPACE_RUN + "d" + "\n" * (MAX_BLANK_LINES + 1) + "e"
+
+
+def test_long_lines_are_split_at_spaces():
+    line = " ".join(["word"] * 1000)
+    shaped = shape_text(line)
+    assert all(len(piece) <= MAX_LINE_CHARS for piece in shaped.split("\n"))
+    assert shaped.replace("\n", " ") == line
+
+
+def test_long_lines_without_spaces_are_hard_split():
+    shaped = shape_text("x" * (MAX_LINE_CHARS * 2 + 1))
+    assert [len(piece) for piece in shaped.split("\n")] == [MAX_LINE_CHARS, MAX_LINE_CHARS, 1]
@@ -0,0 +1,62 @@
+"""
+Tests for request tracing.
+"""
+from app.analyzer import ResumeAnalyzer
+from app.tracing import Tracer, to_otlp, tracer
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def submit(self, spans):
+        self.spans.extend(spans)
+
+
+def test_unsampled_request_records_nothing():
+    """Spans outside a sampled trace are no-ops."""
+    exporter = ListExporter()
+    local = Tracer(sample_rate=0.0, exporter=exporter)
+
+    with local.start_trace("req-1", name="POST /analyze"):
+        with local.span("upload.read") as span:
+            span.set("bytes", 10)
+
+    assert exporter.spans == []
+
+
+def test_sampled_request_traces_analyzer_stages():
+    """A sampled request gets a root span and one child per analyzer stage."""
+    exporter = ListExporter()
+    tracer.configure(1.0, exporter)
+    try:
+        with tracer.start_trace("a" * 32, name="POST /analyze"):
+            ResumeAnalyzer("SKILLS\nPython, SQL\nEXPERIENCE\nEngineer 2020-2023").analyze()
+    finally:
+        tracer.configure(0.0, None)
+
+    spans = {span["name"]: span for span in exporter.spans}
+    root = spans["POST /analyze"]
+    assert root["trace_id"] == "a" * 32
+    assert root["attributes"]["request.id"] == "a" * 32
+    for name in ("detect_sections", "detect_field", "analyze_skills", "analyze_ats_readiness"):
+        assert spans[name]["parent_id"] == root["span_id"]
+    assert spans["detect_sections"]["attributes"]["characters"] > 0
+
+
+def test_remote_spans_are_collected_for_the_parent():
+    """Spans opened under a remote context are collected, not exported."""
+    exporter = ListExporter()
+    local = Tracer(sample_rate=1.0, exporter=exporter)
+
+    with local.remote(("b" * 32, "c" * 16)) as collected:
+        with local.span("worker.analysis"):
+            pass
+
+    assert exporter.spans == []
+    assert collected[0]["trace_id"] == "b" * 32
+    assert collected[0]["parent_id"] == "c" * 16
+
+    otlp_span = to_otlp(collected)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otlp_span["parentSpanId"] == "c" * 16
+    assert otlp_span["name"] == "worker.analysis"
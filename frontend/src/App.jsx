@@ -5,12 +5,76 @@ import FileUpload from './components/FileUpload'
 import Loader from './components/Loader'
 import ScoreDashboard from './components/ScoreDashboard'
 import FeedbackCards from './components/FeedbackCards'
-import axios from 'axios'
 
 const API_URL = import.meta.env.VITE_API_URL 
 
+const EMPTY_PROGRESS = { pages: 0, sections: {}, ats_readiness: null }
+
+// POST the file to /analyze/stream and call onEvent(event, payload) for every
+// Server-Sent Event. EventSource cannot POST, so the stream is parsed by hand.
+async function streamAnalysis(file, onEvent) {
+  const formData = new FormData()
+  formData.append('file', file)
+
+  const response = await fetch(`${API_URL}/analyze/stream`, {
+    method: 'POST',
+    body: formData,
+  })
+
+  if (!response.ok) {
+    const body = await response.json().catch(() => ({}))
+    throw new Error(body.detail || `Request failed with status ${response.status}`)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const message = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+
+      let event = 'message'
+      let data = ''
+      for (const line of message.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim()
+        else if (line.startsWith('data:')) data += line.slice(5).trim()
+      }
+      if (data) onEvent(event, JSON.parse(data))
+    }
+  }
+}
+
+// Hex SHA-256 of the file contents, or null where Web Crypto is unavailable
+// (plain-HTTP origins other than localhost).
+async function hashFile(file) {
+  if (!window.crypto?.subtle) return null
+  const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer())
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, '0')).join('')
+}
+
+// Ask the server whether it already analyzed this exact file. Resolves to the
+// stored result, or null when the file has to be uploaded.
+async function lookupAnalysis(file) {
+  try {
+    const hash = await hashFile(file)
+    if (!hash) return null
+    const response = await fetch(`${API_URL}/analyze/${hash}`)
+    return response.ok ? await response.json() : null
+  } catch {
+    return null
+  }
+}
+
 function App() {
   const [analysisResult, setAnalysisResult] = useState(null)
+  const [progress, setProgress] = useState(EMPTY_PROGRESS)
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState(null)
 
@@ -18,21 +82,35 @@ function App() {
     setLoading(true)
     setError(null)
     setAnalysisResult(null)
+    setProgress(EMPTY_PROGRESS)
 
     try {
-      const formData = new FormData()
-      formData.append('file', file)
-
-      const response = await axios.post(`${API_URL}/analyze`, formData)
+      const cached = await lookupAnalysis(file)
+      if (cached) {
+        setAnalysisResult(cached)
+        return
+      }
 
-
-      setAnalysisResult(response.data)
+      await streamAnalysis(file, (event, payload) => {
+        if (event === 'page') {
+          setProgress((prev) => ({ ...prev, pages: payload.page }))
+        } else if (event === 'restart') {
+          setProgress((prev) => ({ ...prev, pages: 0 }))
+        } else if (event === 'section_score') {
+          setProgress((prev) => ({
+            ...prev,
+            sections: { ...prev.sections, [payload.section]: payload.score },
+          }))
+        } else if (event === 'ats_readiness') {
+          setProgress((prev) => ({ ...prev, ats_readiness: payload.ats_readiness }))
+        } else if (event === 'result') {
+          setAnalysisResult(payload)
+        } else if (event === 'error') {
+          throw new Error(payload.detail)
+        }
+      })
     } catch (err) {
-      setError(
-        err.response?.data?.detail ||
-          err.message ||
-          'An error occurred while analyzing the resume',
-      )
+      setError(err.message || 'An error occurred while analyzing the resume')
     } finally {
       setLoading(false)
     }
@@ -40,9 +118,17 @@ function App() {
 
   const handleReset = () => {
     setAnalysisResult(null)
+    setProgress(EMPTY_PROGRESS)
     setError(null)
   }
 
+  const partialScores = Object.values(progress.sections)
+  const partialResult = partialScores.length > 0 && {
+    score: partialScores.reduce((total, value) => total + value, 0),
+    sections: progress.sections,
+    ats_readiness: progress.ats_readiness,
+  }
+
   return (
     <div className="min-h-screen flex items-center justify-center px-4 py-8 bg-radial-spot">
       <div className="w-full max-w-6xl">
@@ -73,7 +159,7 @@ function App() {
                 Resume Analyzer
               </h1>
               <p className="text-xs md:text-sm text-slate-400 max-w-md">
-                Upload your PDF and get a rule-based breakdown of skills, experience,
+                Upload your resume and get a rule-based breakdown of skills, experience,
                 education, and formatting. No AI — just clear, structured feedback.
               </p>
             </div>
@@ -127,7 +213,13 @@ function App() {
               </motion.div>
             )}
 
-            {loading && <Loader />}
+            {loading && !partialResult && <Loader pages={progress.pages} />}
+
+            {loading && partialResult && (
+              <div className="relative z-10 max-w-md">
+                <ScoreDashboard result={partialResult} />
+              </div>
+            )}
 
             {error && !loading && (
               <motion.div
@@ -178,7 +270,7 @@ function App() {
 
         {/* Subtle footer */}
         <footer className="mt-6 flex items-center justify-between text-[11px] text-slate-500">
-          <span>PDF only · All analysis happens locally on the server</span>
+          <span>PDF, DOCX or TXT · All analysis happens locally on the server</span>
           <span>Built for clarity, not buzzwords</span>
         </footer>
       </div>
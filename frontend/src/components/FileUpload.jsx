@@ -1,5 +1,16 @@
 import { useRef, useState } from 'react'
 
+const ACCEPTED_TYPES = [
+  'application/pdf',
+  'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+  'text/plain',
+]
+const ACCEPTED_EXTENSIONS = ['.pdf', '.docx', '.txt']
+
+const isAcceptedFile = (file) =>
+  ACCEPTED_TYPES.includes(file.type) ||
+  ACCEPTED_EXTENSIONS.some((ext) => file.name.toLowerCase().endsWith(ext))
+
 function FileUpload({ onFileUpload, error }) {
   const fileInputRef = useRef(null)
   const [dragActive, setDragActive] = useState(false)
@@ -22,11 +33,11 @@ function FileUpload({ onFileUpload, error }) {
 
     if (e.dataTransfer.files && e.dataTransfer.files[0]) {
       const file = e.dataTransfer.files[0]
-      if (file.type === 'application/pdf') {
+      if (isAcceptedFile(file)) {
         setSelectedFile(file)
         onFileUpload(file)
       } else {
-        alert('Please upload a PDF file')
+        alert('Please upload a PDF, DOCX or TXT file')
       }
     }
   }
@@ -34,11 +45,11 @@ function FileUpload({ onFileUpload, error }) {
   const handleChange = (e) => {
     if (e.target.files && e.target.files[0]) {
       const file = e.target.files[0]
-      if (file.type === 'application/pdf') {
+      if (isAcceptedFile(file)) {
         setSelectedFile(file)
         onFileUpload(file)
       } else {
-        alert('Please upload a PDF file')
+        alert('Please upload a PDF, DOCX or TXT file')
       }
     }
   }
@@ -64,7 +75,7 @@ function FileUpload({ onFileUpload, error }) {
         <input
           ref={fileInputRef}
           type="file"
-          accept=".pdf"
+          accept={ACCEPTED_EXTENSIONS.join(',')}
           onChange={handleChange}
           className="hidden"
         />
@@ -81,13 +92,13 @@ function FileUpload({ onFileUpload, error }) {
 
           <div className="flex-1 text-left space-y-2">
             <p className="text-sm uppercase tracking-[0.2em] text-slate-500">
-              Upload PDF
+              Upload PDF, DOCX or TXT
             </p>
             <p className="text-lg md:text-xl font-medium text-slate-50">
               {selectedFile ? selectedFile.name : 'Drop your resume here or browse'}
             </p>
             <p className="text-xs md:text-sm text-slate-400">
-              We only read the text from your PDF. No files are stored.
+              We only read the text from your file. No files are stored.
             </p>
           </div>
 
@@ -96,7 +107,7 @@ function FileUpload({ onFileUpload, error }) {
             className="px-5 py-2.5 rounded-xl bg-cyan-500 text-slate-900 text-sm font-medium
             hover:bg-cyan-400 transition-colors shadow-[0_10px_30px_rgba(34,211,238,0.45)]"
           >
-            Choose PDF
+            Choose file
           </button>
         </div>
       </div>
@@ -1,6 +1,6 @@
 import { motion } from 'framer-motion'
 
-function Loader() {
+function Loader({ pages = 0 }) {
   return (
     <div className="flex flex-col items-center justify-center py-12">
       <div className="relative w-20 h-20">
@@ -25,7 +25,9 @@ function Loader() {
         Analyzing your resume...
       </p>
       <p className="mt-1 text-xs text-slate-500">
-        This usually takes just a couple of seconds.
+        {pages > 0
+          ? `Read ${pages} page${pages === 1 ? '' : 's'} so far...`
+          : 'This usually takes just a couple of seconds.'}
       </p>
     </div>
   )